@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
+import sys
 
 from src.GameController import GameController
+from src.helpers.levels import compile_level
 from src.objects.geometrics.SquareObject import SquareObject
 
 from src.objects.geometrics.TriangleObject import TriangleObject 
@@ -113,7 +115,66 @@ def main():
         },
     ]
 
-    game = GameController(title="Minigame - Running Robot", width=1200, height=650, enable3D=False, scheme=scene_scheme)
+    # Lava quality preset: python3 main.py --lava-quality [low|medium|high]
+    lava_quality = "high"
+    if "--lava-quality" in sys.argv:
+        lava_quality = sys.argv[sys.argv.index("--lava-quality")+1]
+
+    # Lava noise read from a precomputed texture (lighter, but not the same pattern): 
+    # python3 main.py --lava-noise-texture
+    FlamesObject.lava_noise_texture = "--lava-noise-texture" in sys.argv
+
+    # Adaptive quality (by the measured frame time): python3 main.py --adaptive-quality
+    adaptive_quality = "--adaptive-quality" in sys.argv
+
+    # Chunked level streaming (chunk size in pixels): python3 main.py --chunk-size 600
+    chunk_size = None
+    if "--chunk-size" in sys.argv:
+        chunk_size = int(sys.argv[sys.argv.index("--chunk-size")+1])
+
+    # Compile the level in a pack: python3 main.py --compile-level level.pack
+    if "--compile-level" in sys.argv:
+        path = sys.argv[sys.argv.index("--compile-level")+1]
+        compile_level(scene_scheme, path, window_resolution=(1200, 650))
+        print("Level compiled in {}".format(path))
+        return
+
+    # Load a compiled level pack instead of the scheme: python3 main.py --level level.pack
+    level_pack = None
+    if "--level" in sys.argv:
+        level_pack = sys.argv[sys.argv.index("--level")+1]
+
+    # Record the player inputs: python3 main.py --record game.bin
+    record_input = None
+    if "--record" in sys.argv:
+        record_input = sys.argv[sys.argv.index("--record")+1]
+
+    # Replay recorded inputs (in the window, or as fast as possible with --headless): 
+    # python3 main.py --replay game.bin
+    replay_input = None
+    if "--replay" in sys.argv:
+        replay_input = sys.argv[sys.argv.index("--replay")+1]
+
+    # Headless mode: python3 main.py --headless [frames]
+    if "--headless" in sys.argv and replay_input != None:
+        game   = GameController(title="Minigame - Running Robot", width=1200, height=650, enable3D=False, scheme=scene_scheme, headless=True, 
+                                lava_quality=lava_quality, chunk_size=chunk_size, level_pack=level_pack)
+        result = game.replay(replay_input)
+        print("{} ticks replayed in {:.3f}s, diverged at: {}".format(result["ticks"], result["seconds"], result["divergence"]))
+        return
+
+    if "--headless" in sys.argv:
+        args   = sys.argv[sys.argv.index("--headless")+1:]
+        frames = int(args[0]) if len(args) > 0 and args[0].isdigit() else 10000
+        game   = GameController(title="Minigame - Running Robot", width=1200, height=650, enable3D=False, scheme=scene_scheme, headless=True, 
+                                lava_quality=lava_quality, chunk_size=chunk_size, level_pack=level_pack)
+        result = game.simulate(frames)
+        print("{} frames in {:.3f}s ({:.1f} logic fps)".format(result["frames"], result["seconds"], result["fps"]))
+        return
+
+    game = GameController(title="Minigame - Running Robot", width=1200, height=650, enable3D=False, scheme=scene_scheme, 
+                          lava_quality=lava_quality, adaptive_quality=adaptive_quality, chunk_size=chunk_size, level_pack=level_pack,
+                          record_input=record_input, replay_input=replay_input)
     game.start()
 
 
@@ -1,10 +1,24 @@
 #!/usr/bin/env python3
+import time
 import glfw
 import numpy as np
 from OpenGL.GL import *
-from PIL import Image
 
+from src.shaders.Shader import Shader
 from src.objects.GameObject import GameObject
+from src.objects.TransformBuffer import TransformBuffer
+from src.objects.StaticBatch import StaticBatch
+from src.objects.VisibilityIndex import VisibilityIndex
+from src.objects.ChunkedWorld import ChunkedWorld
+from src.shaders.RenderTarget import RenderTarget
+from src.shaders.FrameGlobals import FrameGlobals
+from src.QualityGovernor import QualityGovernor
+from src.InputLog import InputLog
+from src.colliders.Hitbox import Hitbox
+from src.colliders.CollisionWorld import CollisionWorld
+from src.helpers.textures import decode_textures, pack_texture_layers
+from src.helpers.vertex import build_vertex_buffer
+from src.helpers.levels import load_level, level_scheme
 from src.objects.geometrics.TriangleObject import TriangleObject
 from src.objects.geometrics.RectangleObject import RectangleObject
 
@@ -16,21 +30,94 @@ class GameController:
     """
 
 
-    def __init__(self, title="Computer Graphics 101", width=600, height=600, enable3D=False, scheme = []) -> None:
+    def __init__(self, title="Computer Graphics 101", width=600, height=600, enable3D=False, scheme = [], headless=False, 
+                 tick_rate=60, render_rate=None, turbo=0, lava_quality="high", adaptive_quality=False,
+                 chunk_size=None, chunk_radius=1, chunk_cache=16, level_pack=None, record_input=None, replay_input=None) -> None:
         """
         Set the program window configurations and other important variables
+
+        In headless mode no window, OpenGL context, GPU buffer or texture is created,
+        so only the objects logic can be executed (see `simulate`).
+
+        The logic runs with a fixed timestep of `tick_rate` iterations per second, while
+        the screen is rendered at `render_rate` frames per second (None = as fast as 
+        possible). If `turbo` is greater than zero, exactly `turbo` logic iterations are
+        executed by rendered frame, ignoring the clock.
+
+        The `lava_quality` preset (low, medium or high) trades the lava detail for speed
+        in slow machines (see `set_lava_quality`). With `adaptive_quality` the graphic 
+        quality is adjusted while the game runs by the measured frame times (see 
+        QualityGovernor), ignoring the `lava_quality` preset.
+
+        With a `chunk_size` (in pixels) the level is split in chunks and only the objects
+        of the chunks near the window or the anchor objects (Ex: robot) exist, keeping up
+        to `chunk_cache` inactive chunks alive (see ChunkedWorld). By default all the 
+        objects are created when the game starts.
+
+        A `level_pack` path (compiled by helpers.levels.compile_level) replaces the
+        `scheme`: the vertex buffer, transforms, hitboxes and broadphase already calculated
+        are memory mapped and copied directly to the vertex buffer, TransformBuffer and 
+        CollisionWorld. With chunks the objects are still created from scheme items, 
+        built from the pack.
+
+        With `record_input` the inputs of each logic iteration are saved in this path when
+        the game window is closed (see InputLog), and with `replay_input` the game plays
+        a recorded log instead of reading the player inputs (see also `replay`).
         """
         self.__glfw_window = False
         self.__glfw_title  = title
         self.__glfw_resolution  = (width, height)
         self.__glfw_enable3D = enable3D
+        self.__headless = headless
+        self.__tick_rate   = tick_rate
+        self.__render_rate = render_rate
+        self.__turbo       = turbo
+        self.__max_ticks_per_frame = 10
+        self.__chunk_size   = chunk_size
+        self.__chunk_radius = chunk_radius
+        self.__chunk_cache  = chunk_cache
+        self.__world = None
+        self.__snapshot = None
+        self.__restart_requested = False
+        self.__record_path = record_input
+        self.__recorder = InputLog(tick_rate) if record_input != None else None
+        self.__replay = InputLog.load(replay_input, tick_rate) if replay_input != None else None
+        self.__replay_tick = 0
+        self.__divergence = None
+        self.__governor = QualityGovernor(render_rate if render_rate else tick_rate) if adaptive_quality and not headless else None
         self.scheme = scheme
-        self.__configure_window()
+        self.__level = None
+        self.__pack_vertices = None
+        self.__cell_size = 100
+        if level_pack != None:
+            self.__level = load_level(level_pack)
+            if chunk_size != None:
+                self.scheme = level_scheme(self.__level)
+            else:
+                self.scheme = [ { "type": object_type, "items": [] } for object_type in self.__level["types"] ]
+            self.__pack_vertices = (self.__level["vertices"], self.__level["ranges"])
+            self.__cell_size = self.__level["cell_size"]
+        self.set_lava_quality(lava_quality)
+        if not self.__headless:
+            self.__configure_window()
         
         self.__objects = []
         self.__vertices = []
         self.__buffer = None
-        self.__solid_objects = []
+        self.__solid_objects = CollisionWorld(cell_size=self.__cell_size)
+        self.__transforms = TransformBuffer(self.__glfw_resolution)
+        self.__static_batch = None
+        self.__static_layer = None
+        self.__texture_array = None
+        self.__frame_globals = None
+        self.__ticks  = 0
+        self.__frames = 0
+        self.__static_groups  = []
+        self.__static_rows    = np.zeros(0, dtype=np.int64)
+        self.__dynamic_groups = []
+        self.__vertex_bounds  = {}
+        self.__visibility = None
+        self.__view = Hitbox("box", [0, 0, width, height])
 
         self.__glfw_keys = {}
         self.__glfw_observe_keys = [glfw.KEY_R]
@@ -39,7 +126,37 @@ class GameController:
         self.__configure_vertexes_and_keys()
         self.__configure_objects()
         self.__configure_buffer()
-        self.__configure_textures()
+        if not self.__headless:
+            self.__configure_textures()
+            self.__static_batch = StaticBatch()
+            self.__static_layer = RenderTarget(width, height)
+            self.__frame_globals = FrameGlobals()
+            self.__configure_layers()
+
+
+    def set_lava_quality(self, quality="high") -> None:
+        """
+        Set the lava quality preset (low, medium or high) of all object types in the scene 
+        scheme that have lava. Can be changed while the game is running.
+        """
+        for object in self.scheme:
+            if hasattr(object["type"], "set_lava_quality"):
+                object["type"].set_lava_quality(quality)
+
+
+    def __apply_quality(self, settings) -> None:
+        """
+        Apply the quality level settings to all object types, regenerating the vertex 
+        buffer if some type changed its vertices and drawing the static layer again.
+        """
+        rebuild = False
+        for object in self.scheme:
+            rebuild = object["type"].set_quality(settings) or rebuild
+
+        if rebuild:
+            self.__configure_vertexes()
+            self.__configure_buffer()
+        self.__configure_layers()
 
 
     def __configure_window(self) -> None:
@@ -65,81 +182,215 @@ class GameController:
         """
         Configure vertex configurations and subscribed keys
         """
+        self.__configure_vertexes()
         for object in self.scheme:
-            # Update Object offset and save vertices in program buffer
-            object["type"].shader_offset = len(self.__vertices)
-            self.__vertices += object["type"].get_vertices()
-
             # Configure observed keys
             if hasattr(object["type"], "subscribe_keys"):
                 self.__glfw_observe_keys += object["type"].subscribe_keys
 
 
+    def __configure_vertexes(self) -> None:
+        """
+        Generate the vertices of all object types (also used to regenerate them when
+        the quality changes, followed by __configure_buffer). The first time, the 
+        vertices of a level pack are used as they are.
+        """
+        if self.__pack_vertices != None:
+            self.__vertices, ranges = self.__pack_vertices
+            self.__pack_vertices = None
+        else:
+            self.__vertices, ranges = build_vertex_buffer([ object["type"] for object in self.scheme ])
+
+        # Local bounds of the type vertices, used by the culling (see VisibilityIndex)
+        for object, (offset, count) in zip(self.scheme, ranges):
+            if count > 0:
+                self.__vertex_bounds[object["type"]] = tuple(np.abs(self.__vertices[offset:offset+count, :2]).max(axis=0).tolist())
+
+
     def __configure_objects(self) -> None:
         """
-        Start/Restart all objects used in the game
+        Start/Restart all objects used in the game (with chunks, only the active ones)
         """
-        self.__objects = []
-        self.__solid_objects = []
+        if self.__chunk_size == None and self.__level != None:
+            self.__load_level_objects()
+        elif self.__chunk_size == None:
+            groups = [ [ (self.__create_item(object, item), item) for item in object["items"] ] for object in self.scheme ]
+            self.__register_objects(groups)
+        else:
+            self.__world = ChunkedWorld(self.scheme, self.__create_item, self.__chunk_size, self.__chunk_radius, self.__chunk_cache)
+            self.__world.focus(self.__focus_regions())
+            self.__register_objects(self.__world.groups())
+
+        # Initial state restored by restart (the chunked objects change while playing)
+        self.__snapshot = None
+        if self.__world == None:
+            self.__snapshot = { "transforms": self.__transforms.snapshot(), 
+                                "objects": [ (item, item.snapshot()) for group in self.__objects for item in group["items"] ] }
+
+
+    def restart(self) -> None:
+        """
+        Restart the game. The objects are restored in place to the initial snapshot (only
+        array copies), or created again when the level is split in chunks.
+        """
+        if self.__snapshot == None:
+            self.__configure_objects()
+            if self.__static_layer != None:
+                self.__configure_layers()
+        else:
+            self.__transforms.restore(self.__snapshot["transforms"])
+            for item, state in self.__snapshot["objects"]:
+                item.restore(state)
+            for item in self.__solid_objects:
+                self.__solid_objects.update(item)
 
-        for object in self.scheme:
-            # Create all desired object items
-            items = []
-            for item in object["items"]:
-                items.append(object["type"](position=item["position"], size=item["size"], rotate=item["rotate"], window_resolution=self.__glfw_resolution))
+        self.__ticks = 0
+
+
+    def __create_item(self, object, item) -> GameObject:
+        """
+        Create the object of a scheme item (and its hitbox if solid, or the one already
+        calculated in a level pack)
+        """
+        instance = object["type"](position=item["position"], size=item["size"], rotate=item["rotate"], window_resolution=self.__glfw_resolution)
+        if "hitbox" in item:
+            instance.object_hitbox = Hitbox("box", item["hitbox"])
+        elif item.get("props", {"hitbox": False})["hitbox"]:
+            instance.configure_hitbox()
+        return instance
+
+
+    def __register_objects(self, groups) -> None:
+        """
+        Register the objects of each scheme group (pairs of object and scheme item) in
+        new transform buffer and collision world
+        """
+        self.__objects = []
+        self.__solid_objects = CollisionWorld(cell_size=self.__cell_size)
+        self.__transforms = TransformBuffer(self.__glfw_resolution)
+
+        for object, pairs in zip(self.scheme, groups):
+            # Each group uses consecutive transform rows
+            first_row = self.__transforms.count
+            for instance, item in pairs:
+                self.__transforms.insert(instance)
                 
-                # If is solid create a reference in the solid objects array
-                if item.get("props", {"hitbox": False})["hitbox"]:
-                    items[-1].configure_hitbox()
-                    if items[-1].object_hitbox != None:
-                        self.__solid_objects.append(items[-1])
+                # If is solid register it in the collision world
+                if item.get("props", {"hitbox": False})["hitbox"] and instance.object_hitbox != None:
+                    self.__solid_objects.insert(instance, item.get("cells"))
 
             # Append created items to objects
-            self.__objects.append({"type": object["type"], "items": items })
+            self.__objects.append({"type": object["type"], "items": [ instance for instance, _ in pairs ], "rows": (first_row, self.__transforms.count) })
+
+
+    def __load_level_objects(self) -> None:
+        """
+        Create the objects of a level pack and copy its arrays directly to new transform 
+        buffer and collision world (with the broadphase already built), without scheme items
+        """
+        level  = self.__level
+        groups = np.asarray(level["groups"])
+        position, size, rotate = np.asarray(level["position"]), np.asarray(level["size"]), np.asarray(level["rotate"])
+        items = [ level["types"][group](position=position[row], size=size[row], rotate=rotate[row], window_resolution=self.__glfw_resolution)
+                    for row, group in enumerate(groups.tolist()) ]
+
+        self.__transforms = TransformBuffer(self.__glfw_resolution)
+        self.__transforms.load(items, position, size, rotate)
+        self.__solid_objects = CollisionWorld(cell_size=self.__cell_size)
+        self.__solid_objects.load([ items[row] for row in level["solid"].tolist() ], level["hitboxes"], level["broadphase"])
+
+        # The items of each group are in consecutive rows
+        bounds = np.searchsorted(groups, np.arange(len(level["types"]) + 1)).tolist()
+        self.__objects = [ { "type": object_type, "items": items[bounds[index]:bounds[index+1]], "rows": (bounds[index], bounds[index+1]) }
+                            for index, object_type in enumerate(level["types"]) ]
+
+
+    def __focus_regions(self) -> list:
+        """
+        Regions (x0, y0, x1, y1) in pixels that keep its chunks active: the window and
+        the anchor objects
+        """
+        regions = [ (0, 0, self.__glfw_resolution[0], self.__glfw_resolution[1]) ]
+        for item in self.__world.anchors():
+            regions.append((item.position[0] - 0.5*item.size[0], item.position[1] - 0.5*item.size[1],
+                            item.position[0] + 0.5*item.size[0], item.position[1] + 0.5*item.size[1]))
+        return regions
 
 
     def __configure_buffer(self) -> None:
         """
-        Instantiate a buffer in GPU and send the vertex data.
+        Instantiate a buffer in GPU and send the vertex data. The vertex arrays of the
+        programs are created with the first buffer and stay valid when it's updated.
         """
-        self.__vertices = np.array(self.__vertices, dtype=np.float32)
-        self.__buffer = glGenBuffers(1)
+        self.__vertices = np.asarray(self.__vertices, dtype=np.float32)
+        if self.__headless:
+            return
+
+        if self.__buffer == None:
+            self.__buffer = glGenBuffers(1)
         glBindBuffer(GL_ARRAY_BUFFER, self.__buffer)
         glBufferData(GL_ARRAY_BUFFER, self.__vertices.nbytes, self.__vertices, GL_STATIC_DRAW)
+        Shader.vertex_buffer = self.__buffer
+        for object in self.scheme:
+            object["type"].shader_program.configure_vertex_array()
 
 
-    def __configure_textures(self) -> None:
+    def __configure_layers(self) -> None:
         """
-        Instantiate and initialize all textures used by te objects
+        Split the object groups (in draw order, reversed because first groups have priority)
+        in two render layers: the static layer, with the static groups drawn before any
+        dynamic group, drawn once in an offscreen target; and the dynamic layer, drawn 
+        every frame over it. Static types are always drawn with the static batch.
         """
+        groups = self.__static_batch.build(list(reversed(self.__objects)), self.__vertices, self.__transforms)
+        first_dynamic = len(groups)
+        for index, group in enumerate(groups):
+            if "batch" not in group and not group["type"].static:
+                first_dynamic = index
+                break
+
+        self.__static_groups  = groups[:first_dynamic]
+        self.__dynamic_groups = groups[first_dynamic:]
+        self.__static_rows    = np.array([ row for group in self.__objects if group["type"].static 
+                                                for row in range(*group["rows"]) ], dtype=np.int64)
+        self.__visibility = VisibilityIndex(self.__objects, self.__transforms, self.__vertex_bounds)
+        self.__static_layer.invalidate()
 
-        # Calc. the sum number of textures needed and generate them
-        qtd_textures = 0
-        for object in self.scheme:
-            qtd_textures += len(object["type"].shader_textures)
+
+    def __configure_textures(self) -> None:
+        """
+        Instantiate and initialize all textures used by the objects as the layers of a 
+        single texture array, so textured types never need to rebind textures (each type
+        receives its layers indexes in `shader_textures_layers`).
+        """
+        textures = [ texture for object in self.scheme for texture in object["type"].shader_textures ]
 
         # If no textures to create then exits
-        if qtd_textures == 0:
+        if len(textures) == 0:
             return 
 
-        # Init all the textures
-        texture_id = 1
-        glGenTextures(qtd_textures)
+        # Decode all the images in parallel (or read them from the disk cache)
+        layers = pack_texture_layers(decode_textures(textures))
+
+        # Texture Settings
+        self.__texture_array = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D_ARRAY, self.__texture_array)
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_WRAP_S, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_WRAP_T, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D_ARRAY, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+
+        # Load all layers and generate midmap
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexImage3D(GL_TEXTURE_2D_ARRAY, 0, GL_RGB8, layers.shape[2], layers.shape[1], layers.shape[0], 0, GL_RGB, GL_UNSIGNED_BYTE, layers)
+        glGenerateMipmap(GL_TEXTURE_2D_ARRAY)
+
+        # Set the layers of each type
+        layer = 0
         for object in self.scheme:
-            for texture in object["type"].shader_textures:
-                # Texture Settings
-                glBindTexture(GL_TEXTURE_2D, texture_id)
-                glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT);	
-                glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
-                glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-                glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-                # Load image and generate midmap
-                image = Image.open(texture)
-                glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, image.size[0], image.size[1], 0, GL_RGB, GL_UNSIGNED_BYTE, image.tobytes("raw", "RGB", 0, -1))
-                glGenerateMipmap(GL_TEXTURE_2D)
-                # Set id and increment
-                object["type"].shader_textures_ids.append(texture_id)
-                texture_id += 1
+            count = len(object["type"].shader_textures)
+            object["type"].shader_textures_layers = list(range(layer, layer + count))
+            layer += count
 
 
     def __key_event_handler(self, window, key, scancode, action, mods):
@@ -147,8 +398,8 @@ class GameController:
         Manipula os eventos de teclados lidos pelo GLFW e salva as mudanças de estado 
         apenas das teclas de interesse para economizar memória não necessária
         """
-        if key in self.__glfw_observe_keys:
-            self.__glfw_keys[key] = { "action": action, "code": scancode, "mods": mods }
+        if self.__replay == None:
+            self.__apply_input(InputLog.KEY, key, action, mods, scancode)
 
 
     def __mouse_event_handler(self, window, button, action, mods):
@@ -156,13 +407,141 @@ class GameController:
         Manipula os eventos de mouse que, como são menores, não necessita de uma
         seleção tão aguçada de quais estados salvar
         """
-        self.__glfw_buttons[button] = { "action": action, "mods": mods }
+        if self.__replay == None:
+            self.__apply_input(InputLog.BUTTON, button, action, mods)
+
+
+    def __apply_input(self, kind, code, action, mods, scancode=0) -> None:
+        """
+        Update the inputs state with a keyboard (key) or mouse (button) event, read from
+        GLFW or from a replayed log, recording it if the inputs are being recorded
+        """
+        if kind == InputLog.KEY:
+            if code not in self.__glfw_observe_keys:
+                return
+            self.__glfw_keys[code] = { "action": action, "code": scancode, "mods": mods }
+            if code == glfw.KEY_R and action == glfw.PRESS:
+                self.__restart_requested = True
+        else:
+            self.__glfw_buttons[code] = { "action": action, "mods": mods }
+
+        if self.__recorder != None:
+            self.__recorder.push(kind, code, action, mods, scancode)
+
+
+    def __logic_step(self) -> None:
+        """
+        Execute one iteration of the game logic (restart and objects logics), without
+        any draw call, so it can be used with or without a window.
+        """
+        # If key R was pressed restart the game (once by press)
+        if self.__restart_requested:
+            self.__restart_requested = False
+            self.restart()
+
+        # Execute objects logics, if object is solid pass the collision world to be
+        # used in the collision logics calculation and update its broadphase after
+        for object_group in reversed(self.__objects):
+            for item in object_group["items"]:
+                if item.object_hitbox == None:
+                    item.logic(keys=self.__glfw_keys, buttons=self.__glfw_buttons)
+                else:
+                    item.logic(keys=self.__glfw_keys, buttons=self.__glfw_buttons, objects=self.__solid_objects)
+                    self.__solid_objects.update(item)
+
+        # Stream the chunks near the anchors, registering the new set of objects
+        if self.__world != None and self.__world.focus(self.__focus_regions()):
+            self.__register_objects(self.__world.groups())
+            if self.__static_layer != None:
+                self.__configure_layers()
+
+        # Simulation clock (shared by the shaders, see FrameGlobals)
+        self.__ticks += 1
+
+
+    def __tick(self) -> None:
+        """
+        Execute one fixed timestep iteration saving the objects previous state, 
+        used to interpolate the rendering between two iterations.
+        """
+        if self.__replay != None:
+            for event in self.__replay.ticks[self.__replay_tick][1]:
+                self.__apply_input(*event)
+
+        self.__transforms.save_previous()
+        self.__logic_step()
+
+        # Record the world state after the iteration or check if the replay diverged
+        if self.__recorder != None:
+            self.__recorder.commit(self.__transforms.checksum())
+        if self.__replay != None:
+            if self.__divergence == None and self.__transforms.checksum() != self.__replay.ticks[self.__replay_tick][0]:
+                self.__divergence = self.__replay_tick
+            self.__replay_tick += 1
+
+
+    def replay(self, path) -> dict:
+        """
+        Restart the game and play the input log recorded in `path` as fast as possible,
+        without window or draw calls. Returns the iterations and time spent, and the 
+        first iteration where the world state differs from the recorded (or None).
+        """
+        self.__replay = InputLog.load(path, self.__tick_rate)
+        self.__replay_tick = 0
+        self.__divergence  = None
+        self.__glfw_keys.clear()
+        self.__glfw_buttons.clear()
+        self.__restart_requested = False
+        self.restart()
+
+        start = time.perf_counter()
+        while self.__replay_tick < len(self.__replay.ticks):
+            self.__tick()
+        elapsed = time.perf_counter() - start
+
+        return { "ticks": self.__replay_tick, "seconds": elapsed, "divergence": self.__divergence }
+
+
+    def simulate(self, frames=1000) -> dict:
+        """
+        Run the game logic in a tight loop, without window or draw calls, and return
+        the throughput measured. Useful to validate levels in batch (headless mode).
+        """
+        start = time.perf_counter()
+        for _ in range(frames):
+            self.__logic_step()
+        elapsed = time.perf_counter() - start
+
+        return { "frames": frames, "seconds": elapsed, "fps": frames / elapsed if elapsed > 0 else float("inf") }
+
+
+    def __draw_groups(self, groups) -> None:
+        """
+        Foreach object group active the shader and draw the visible items (outside the
+        window they are culled). Static batch steps are drawn from the static batch.
+        """
+        for object_group in groups:
+            if "batch" in object_group:
+                self.__static_batch.draw(*object_group["batch"])
+                continue
+
+            items, rows = self.__visibility.visible(object_group, self.__view)
+            if len(items) == 0:
+                continue
+
+            object_group["type"].prepare_draw(items)
+            object_group["type"].shader_program.use()
+            for item in items:
+                item.draw()
 
 
     def start(self) -> None:
         """
         Start the game logic and graphic loop. Runs until the player close the window.
         """
+        if self.__headless:
+            raise RuntimeError("GameController in headless mode can only simulate()")
+
         glfw.show_window(self.__glfw_window)
 
         if self.__glfw_enable3D:
@@ -172,8 +551,40 @@ class GameController:
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
+        tick_time   = 1.0 / self.__tick_rate
+        accumulator = 0.0
+        last_time   = glfw.get_time()
+
         while not glfw.window_should_close(self.__glfw_window):
             glfw.poll_events() 
+
+            # A replay ends with the recorded log
+            if self.__replay != None and self.__replay_tick >= len(self.__replay.ticks):
+                break
+
+            # Measure the elapsed time since the last frame
+            current_time = glfw.get_time()
+            frame_time   = current_time - last_time
+            last_time    = current_time
+
+            # Run the logic ticks that fit in the elapsed time (or a fixed number of 
+            # ticks in turbo mode). Limits the ticks to avoid the spiral of death.
+            if self.__turbo > 0:
+                ticks = self.__turbo
+                alpha = 1.0
+            else:
+                accumulator += frame_time
+                ticks = int(accumulator / tick_time)
+                accumulator -= ticks * tick_time
+                if ticks > self.__max_ticks_per_frame:
+                    ticks = self.__max_ticks_per_frame
+                    accumulator = 0.0
+                alpha = accumulator / tick_time
+
+            if self.__replay != None:
+                ticks = min(ticks, len(self.__replay.ticks) - self.__replay_tick)
+            for _ in range(ticks):
+                self.__tick()
             
             # Reset the screen with the white color
             if self.__glfw_enable3D:
@@ -182,28 +593,54 @@ class GameController:
                 glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT) 
             glClearColor(0.709, 0.486, 0.443, 1.0)
 
-            # If key R pressed restart the game
-            if self.__glfw_keys.get(glfw.KEY_R, {"action": 0})["action"]:
-                self.__configure_objects()
-
-            # Execute objects logics, if object is solid pass all solid objects to 
-            # be used in the collision logics calculation
-            for object_group in reversed(self.__objects):
-                for item in object_group["items"]:
-                    if item.object_hitbox == None:
-                        item.logic(keys=self.__glfw_keys, buttons=self.__glfw_buttons)
-                    else:
-                        item.logic(keys=self.__glfw_keys, buttons=self.__glfw_buttons, objects=self.__solid_objects)
+            # If some static object was changed the static layer must be drawn again. Only the
+            # dirty flag is checked: the interpolating flag stays set until the next tick, and 
+            # the layer is drawn with the current state of the static objects
+            if self.__transforms.dirty[self.__static_rows].any():
+                self.__configure_layers()
+
+            # Update the bounds of the moved objects and compute all the (interpolated) 
+            # model matrices at once
+            self.__visibility.update()
+            self.__transforms.compute(alpha)
+
+            # Send the frame globals once, the time is the simulation time of the drawn state
+            # (interpolated between the last two ticks), so it doesn't depend on the fps
+            simulation_time = max(0.0, (self.__ticks - 1 + alpha) * tick_time)
+            self.__frame_globals.update(self.__glfw_resolution, simulation_time, self.__frames)
+            self.__frames += 1
+
+            # Draw the static layer offscreen only when invalid, then put it on the screen
+            # and draw the dynamic layer over it
+            if not self.__static_layer.valid:
+                self.__static_layer.bind()
+                glClear(GL_COLOR_BUFFER_BIT)
+                self.__draw_groups(self.__static_groups)
+                self.__static_layer.unbind()
+
+            self.__static_layer.draw()
+            self.__draw_groups(self.__dynamic_groups)
+
+            # Adjust the graphic quality by the time spent in the frame. It's measured before
+            # the swap, which blocks until the vertical sync, after waiting for the GPU
+            if self.__governor != None:
+                glFinish()
+                settings = self.__governor.record(glfw.get_time() - current_time)
+                if settings != None:
+                    self.__apply_quality(settings)
 
+            glfw.swap_buffers(self.__glfw_window)
 
-            # Foreach object group active the shader and draw items
-            # Obs: Reversed because first groups have priority.
-            for object_group in reversed(self.__objects):
-                object_group["type"].shader_program.use()
-                for item in object_group["items"]:
-                    item.draw()
+            # Wait until the next frame if the render rate is limited
+            if self.__render_rate:
+                remaining = (1.0 / self.__render_rate) - (glfw.get_time() - current_time)
+                if remaining > 0:
+                    time.sleep(remaining)
 
-            glfw.swap_buffers(self.__glfw_window)
+        if self.__recorder != None:
+            self.__recorder.save(self.__record_path)
+        if self.__replay != None and self.__divergence != None:
+            print("Replay diverged from the recorded game at iteration {}".format(self.__divergence))
         glfw.terminate()
 
 
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+import struct
+
+
+class InputLog:
+    """
+    Registro binário das entradas (teclado e mouse) recebidas em cada iteração da lógica,
+    junto do hash do estado do mundo após a iteração (ver TransformBuffer.checksum).
+    Permite reproduzir uma partida de forma determinística e detectar em qual iteração
+    a reprodução divergiu da gravação.
+
+    Como o estado das entradas é mantido entre as iterações, apenas os eventos (mudanças)
+    são registrados, e a maioria das iterações ocupa somente 6 bytes.
+
+    Formato (little-endian): cabeçalho b"RRIL", versão (uint16) e iterações por segundo
+    (uint16); e para cada iteração o hash (uint32), o número de eventos (uint16) e os
+    eventos: tipo (uint8, KEY ou BUTTON), tecla ou botão (int16), ação (uint8),
+    modificadores (uint8) e scancode (int32).
+    """
+
+    KEY    = 0
+    BUTTON = 1
+
+    magic   = b"RRIL"
+    version = 1
+    header_format = "<4sHH"
+    tick_format   = "<IH"
+    event_format  = "<BhBBi"
+
+
+    def __init__(self, tick_rate=60) -> None:
+        """Cria o registro vazio (`ticks` é a lista de pares (hash, eventos))"""
+        self.tick_rate = tick_rate
+        self.ticks = []
+        self.__pending = []
+
+
+    def push(self, kind, code, action, mods, scancode=0) -> None:
+        """Registra um evento, que pertence à próxima iteração da lógica"""
+        self.__pending.append((kind, code, action, mods, scancode))
+
+
+    def commit(self, state_hash) -> None:
+        """Fecha a iteração atual com os eventos pendentes e o hash do mundo após ela"""
+        self.ticks.append((state_hash, self.__pending))
+        self.__pending = []
+
+
+    def save(self, path) -> None:
+        """Salva o registro no arquivo informado"""
+        with open(path, "wb") as file:
+            file.write(struct.pack(InputLog.header_format, InputLog.magic, InputLog.version, self.tick_rate))
+            for state_hash, events in self.ticks:
+                file.write(struct.pack(InputLog.tick_format, state_hash, len(events)))
+                for event in events:
+                    file.write(struct.pack(InputLog.event_format, *event))
+
+
+    def load(path, tick_rate=None) -> "InputLog":
+        """
+        Lê um registro salvo por save(). Se `tick_rate` for informado, o registro deve ter
+        sido gravado com as mesmas iterações por segundo, pois caso contrário a reprodução
+        não seria equivalente à partida gravada.
+        """
+        with open(path, "rb") as file:
+            content = file.read()
+
+        magic, version, stored_rate = struct.unpack_from(InputLog.header_format, content, 0)
+        if magic != InputLog.magic or version != InputLog.version:
+            raise ValueError("Registro de entradas inválido: {}".format(path))
+        if tick_rate != None and tick_rate != stored_rate:
+            raise ValueError("Registro de entradas gravado com {} iterações por segundo, mas o jogo usa {}: {}".format(stored_rate, tick_rate, path))
+
+        log = InputLog(stored_rate)
+        offset = struct.calcsize(InputLog.header_format)
+        tick_size, event_size = struct.calcsize(InputLog.tick_format), struct.calcsize(InputLog.event_format)
+        while offset < len(content):
+            state_hash, count = struct.unpack_from(InputLog.tick_format, content, offset)
+            offset += tick_size
+            events = [ struct.unpack_from(InputLog.event_format, content, offset + i*event_size) for i in range(count) ]
+            offset += count * event_size
+            log.ticks.append((state_hash, events))
+        return log
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+from collections import deque
+
+
+class QualityGovernor:
+    """
+    Ajusta o nível de qualidade gráfica do jogo a partir do tempo medido dos frames,
+    mantido em uma janela móvel. Quando a média da janela passa do tempo alvo o nível é
+    reduzido, e quando há folga suficiente ele volta a subir.
+
+    Cada nível é um dicionário de configurações repassado aos tipos de objetos da cena
+    (ver GameObject.set_quality), do nível com maior qualidade (0) ao mais leve.
+
+    Para evitar oscilar entre dois níveis, cada vez que um aumento de qualidade é
+    desfeito logo em seguida (em até `backoff_windows` janelas) a folga exigida para
+    subir novamente dobra de duração.
+    """
+
+    levels = [
+        { "lava": "high",   "tessellation": 1.0,  "pattern_repeat": 1.0 },
+        { "lava": "medium", "tessellation": 1.0,  "pattern_repeat": 1.0 },
+        { "lava": "medium", "tessellation": 0.5,  "pattern_repeat": 0.5 },
+        { "lava": "low",    "tessellation": 0.5,  "pattern_repeat": 0.5 },
+        { "lava": "low",    "tessellation": 0.25, "pattern_repeat": 0.25 },
+    ]
+
+
+    def __init__(self, target_fps=60, window=60, levels=None, backoff_windows=4) -> None:
+        """
+        Cria o governador no nível de maior qualidade. O alvo é perdido quando a média da
+        janela (de `window` frames) passa de 110% do tempo de um frame, e há folga quando
+        ela fica abaixo de 60%.
+        """
+        self.levels = levels if levels != None else QualityGovernor.levels
+        self.level  = 0
+        self.target_time = 1.0 / target_fps
+        self.__frame_times = deque(maxlen=window)
+        self.__headroom_frames = 0
+        self.__patience = 1
+        self.__backoff_frames = backoff_windows * window
+        self.__frame = 0
+        self.__last_raise = None
+
+
+    def settings(self) -> dict:
+        """Retorna as configurações do nível atual"""
+        return self.levels[self.level]
+
+
+    def record(self, frame_time) -> dict:
+        """
+        Registra o tempo (em segundos) de um frame. Retorna as configurações do novo nível
+        caso ele tenha mudado, ou None caso contrário.
+        """
+        self.__frame += 1
+        self.__frame_times.append(frame_time)
+        if len(self.__frame_times) < self.__frame_times.maxlen:
+            return None
+
+        average = sum(self.__frame_times) / len(self.__frame_times)
+        if average > 1.1 * self.target_time:
+            self.__headroom_frames = 0
+            if self.level == len(self.levels) - 1:
+                return None
+            if self.__last_raise != None and self.__frame - self.__last_raise <= self.__backoff_frames:
+                self.__patience = min(2 * self.__patience, 32)
+            return self.__step(+1)
+
+        if average < 0.6 * self.target_time and self.level > 0:
+            self.__headroom_frames += 1
+            if self.__headroom_frames >= self.__patience * self.__frame_times.maxlen:
+                return self.__step(-1)
+        else:
+            self.__headroom_frames = 0
+        return None
+
+
+    def __step(self, direction) -> dict:
+        """Muda de nível e reinicia as medições (que eram do nível anterior)"""
+        self.level += direction
+        if direction < 0:
+            self.__last_raise = self.__frame
+        self.__headroom_frames = 0
+        self.__frame_times.clear()
+        return self.levels[self.level]
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+import numpy as np
+
+from src.colliders.Hitbox import Hitbox
+from src.colliders.SpatialHash import SpatialHash
+
+
+class CollisionWorld:
+    """
+    Mundo de colisões que mantém os hitboxes do tipo box de todos os objetos sólidos
+    em um único array numpy contíguo (N x [x, y, w, h]). O hitbox de cada objeto 
+    registrado passa a ser uma view da sua linha, então as alterações feitas pelo
+    configure_hitbox dos objetos já são refletidas no mundo.
+
+    As consultas usam um SpatialHash de linhas como broadphase e resolvem a colisão
+    contra todos os candidatos com uma única comparação vetorizada.
+
+    Obs: hitboxes de outros tipos não são armazenados (Hitbox.check_collision não 
+    possui colisão para eles).
+    """
+
+
+    def __init__(self, capacity=64, cell_size=100) -> None:
+        """Cria o mundo vazio com a capacidade inicial de linhas informada"""
+        self.cell_size = cell_size
+        self.boxes = np.zeros((capacity, 4), dtype=np.float64)
+        self.__owners = []
+        self.__free_rows = []
+        self.__rows = {}
+        self.__broadphase = SpatialHash(cell_size)
+
+
+    def __grow(self) -> None:
+        """Dobra a capacidade do armazenamento e revincula as views dos hitboxes"""
+        boxes = np.zeros((2*len(self.boxes), 4), dtype=np.float64)
+        boxes[:len(self.boxes)] = self.boxes
+        self.boxes = boxes
+
+        for row, item in enumerate(self.__owners):
+            if item != None:
+                item.object_hitbox.bind(self.boxes[row], row)
+
+
+    def insert(self, item, cells=None) -> None:
+        """
+        Registra o objeto sólido, movendo os valores do seu hitbox para o mundo. As 
+        células do broadphase já calculadas podem ser informadas em `cells`.
+        """
+        hitbox = item.object_hitbox
+        if hitbox.type != "box" or item in self.__rows:
+            return
+
+        if len(self.__free_rows) > 0:
+            row = self.__free_rows.pop()
+        else:
+            row = len(self.__owners)
+            self.__owners.append(None)
+            if row >= len(self.boxes):
+                self.__grow()
+
+        self.__owners[row] = item
+        self.__rows[item] = row
+        hitbox.bind(self.boxes[row], row)
+        self.__broadphase.insert(row, hitbox, cells)
+
+
+    def load(self, items, boxes, broadphase) -> None:
+        """
+        Preenche o mundo vazio com os objetos sólidos informados, nesta ordem de linhas,
+        copiando todos os boxes de uma vez e carregando o broadphase já calculado (arrays
+        de SpatialHash.export, com as linhas como itens). Os hitboxes dos objetos são
+        criados como views das suas linhas (Ex: pacotes de fase, ver helpers.levels).
+        """
+        count = len(items)
+        if count > len(self.boxes):
+            self.boxes = np.zeros((count, 4), dtype=np.float64)
+        self.boxes[:count] = boxes
+
+        self.__owners = list(items)
+        self.__rows = { item: row for row, item in enumerate(items) }
+        for row, item in enumerate(items):
+            item.object_hitbox = Hitbox("box", self.boxes[row])
+            item.object_hitbox.bind(self.boxes[row], row)
+        self.__broadphase.load(broadphase)
+
+
+    def remove(self, item) -> None:
+        """Remove o objeto do mundo, devolvendo ao hitbox um armazenamento próprio"""
+        row = self.__rows.pop(item, None)
+        if row == None:
+            return
+
+        item.object_hitbox.unbind()
+        self.__owners[row] = None
+        self.__free_rows.append(row)
+        self.__broadphase.remove(row)
+
+
+    def update(self, item) -> None:
+        """Atualiza o broadphase após o hitbox do objeto ter sido alterado"""
+        row = self.__rows.get(item)
+        if row != None:
+            self.__broadphase.update(row, item.object_hitbox)
+
+
+    def __candidates(self, hitbox) -> np.ndarray:
+        """Linhas próximas ao hitbox segundo o broadphase"""
+        rows = self.__broadphase.query(hitbox)
+        return np.fromiter(rows, dtype=np.intp, count=len(rows))
+
+
+    def __overlaps(self, hitbox, exclude=None) -> np.ndarray:
+        """Linhas cujos boxes colidem com o hitbox (método AABB vetorizado)"""
+        rows = self.__candidates(hitbox)
+        if exclude != None and exclude in self.__rows:
+            rows = rows[rows != self.__rows[exclude]]
+
+        x, y, w, h = hitbox.box.tolist()
+        boxes = self.boxes[rows]
+        mask  = (x < boxes[:, 0] + boxes[:, 2]) & (x + w > boxes[:, 0]) & \
+                (y < boxes[:, 1] + boxes[:, 3]) & (y + h > boxes[:, 1])
+
+        return rows[mask]
+
+
+    def query(self, hitbox) -> list:
+        """
+        Retorna os objetos próximos ao hitbox (candidatos do broadphase), na ordem de
+        inserção. É necessário verificar a colisão de cada um.
+        """
+        return [self.__owners[row] for row in self.__candidates(hitbox)]
+
+
+    def collisions(self, hitbox, exclude=None) -> list:
+        """
+        Retorna os objetos que colidem com o hitbox, na ordem de inserção, 
+        ignorando o objeto `exclude` (normalmente o próprio objeto).
+        """
+        return [self.__owners[row] for row in self.__overlaps(hitbox, exclude)]
+
+
+    def collides(self, hitbox, exclude=None, types=None) -> bool:
+        """
+        Verifica se o hitbox colide com algum objeto do mundo (exceto `exclude`). 
+        Se `types` for informado considera apenas objetos desses tipos.
+        """
+        rows = self.__overlaps(hitbox, exclude)
+        if types == None:
+            return len(rows) > 0
+
+        return any(type(self.__owners[row]) in types for row in rows)
+
+
+    def __iter__(self):
+        return iter(self.__rows)
+
+
+    def __len__(self) -> int:
+        return len(self.__rows)
@@ -18,6 +18,10 @@ class Hitbox:
         Poligono convexo definido pelo conjunto de vertices recebidos
     circle: [x_c, y_c, radius]
         hitbox circular definido pela posicao do centro do circulo e seu raio
+
+    Os valores do tipo box ficam em um array numpy [x, y, w, h] que, quando o hitbox
+    é registrado em um CollisionWorld, passa a ser uma view da linha correspondente
+    no armazenamento contíguo do mundo.
     """
 
 
@@ -28,9 +32,10 @@ class Hitbox:
         dentro da tela.
         """
         self.type = type
-        self.box  = []
+        self.box  = np.zeros(4, dtype=np.float64)
         self.circle = {}
         self.edges = []
+        self.world_index = None
         self.update_values(args)
 
 
@@ -39,12 +44,28 @@ class Hitbox:
         Atualiza os valores do hitbox com os valores recebidos
         """
         if self.type == "box":
-            self.box = {"x": args[0], "y": args[1], "w": args[2], "h": args[3]}
+            self.box[:] = args
         elif self.type == "circle":
             self.circle = {"x": args[0], "y": args[1], "r": args[2]}
         else:
             self.edges = args
 
+
+    def bind(self, storage, index) -> None:
+        """
+        Copia os valores do box para a linha `storage` (view de um CollisionWorld) e
+        passa a utilizá-la como armazenamento.
+        """
+        storage[:] = self.box
+        self.box = storage
+        self.world_index = index
+
+
+    def unbind(self) -> None:
+        """Volta a utilizar um armazenamento próprio, desvinculando do CollisionWorld"""
+        self.box = np.array(self.box, dtype=np.float64)
+        self.world_index = None
+
         
     def check_collision(self, object) -> bool:
         """
@@ -64,14 +85,10 @@ class Hitbox:
     def __box_box_collision(self, object) -> bool:
         """Box vs Box collision (AABB method) does not have reaction"""
 
-        collision = True
-
-        collision &= self.box['x'] < object.box['x'] + object.box["w"]
-        collision &= self.box['x'] + self.box['w'] > object.box["x"]
-        collision &= self.box['y'] < object.box['y'] + object.box["h"]
-        collision &= self.box['y'] + self.box['h'] > object.box["y"]
+        x, y, w, h = self.box.tolist()
+        ox, oy, ow, oh = object.box.tolist()
 
-        return collision
+        return x < ox + ow and x + w > ox and y < oy + oh and y + h > oy
             
 
 
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+import math
+import numpy as np
+
+
+class SpatialHash:
+    """
+    Broadphase baseado em uma grade uniforme (spatial hash). Cada item é registrado em
+    todas as células cobertas pelo seu hitbox, permitindo consultar apenas os itens
+    próximos ao invés de percorrer a lista inteira.
+
+    Os itens são chaves simples, em geral a linha do objeto em um armazenamento
+    vetorizado (Ex: CollisionWorld e VisibilityIndex), e o hitbox de cada item é sempre
+    informado na inserção e atualização. O intervalo de células também pode ser
+    informado na inserção, quando já foi calculado. As consultas e a iteração retornam
+    os itens na ordem de inserção.
+
+    Um hash de itens inteiros pode ser exportado em arrays (export) e carregado
+    diretamente em um hash vazio (load), sem calcular as células novamente (ver os
+    pacotes de fase em helpers.levels).
+    """
+
+
+    def __init__(self, cell_size=100) -> None:
+        """
+        Cria a grade vazia. O tamanho da célula (em pixels) deve ser próximo do
+        tamanho médio dos objetos da cena.
+        """
+        self.cell_size = cell_size
+        self.__cells = {}
+        self.__items = {}
+        self.__order = {}
+        self.__counter = 0
+
+
+    def cell_range(self, hitbox) -> tuple:
+        """Calcula o intervalo de células (i0, j0, i1, j1) coberto pelo hitbox"""
+        if hitbox.type == "box":
+            x0, y0, w, h = hitbox.box.tolist()
+            x1, y1 = x0 + w, y0 + h
+        elif hitbox.type == "circle":
+            x0, y0 = hitbox.circle["x"] - hitbox.circle["r"], hitbox.circle["y"] - hitbox.circle["r"]
+            x1, y1 = hitbox.circle["x"] + hitbox.circle["r"], hitbox.circle["y"] + hitbox.circle["r"]
+        else:
+            x0, y0 = min(v[0] for v in hitbox.edges), min(v[1] for v in hitbox.edges)
+            x1, y1 = max(v[0] for v in hitbox.edges), max(v[1] for v in hitbox.edges)
+
+        return (math.floor(x0 / self.cell_size), math.floor(y0 / self.cell_size),
+                math.floor(x1 / self.cell_size), math.floor(y1 / self.cell_size))
+
+
+    def __link(self, item, cells) -> None:
+        """Registra o item em todas as células do intervalo"""
+        for i in range(cells[0], cells[2]+1):
+            for j in range(cells[1], cells[3]+1):
+                self.__cells.setdefault((i, j), set()).add(item)
+        self.__items[item] = cells
+
+
+    def __unlink(self, item) -> None:
+        """Remove o item de todas as células em que está registrado"""
+        cells = self.__items.pop(item)
+        for i in range(cells[0], cells[2]+1):
+            for j in range(cells[1], cells[3]+1):
+                bucket = self.__cells[(i, j)]
+                bucket.discard(item)
+                if len(bucket) == 0:
+                    del self.__cells[(i, j)]
+
+
+    def insert(self, item, hitbox, cells=None) -> None:
+        """
+        Adiciona um novo item ao hash. O intervalo de células do hitbox pode ser informado
+        em `cells` se já foi calculado (Ex: pacotes de fase, ver helpers.levels).
+        """
+        if item in self.__items:
+            return self.update(item, hitbox)
+
+        self.__order[item] = self.__counter
+        self.__counter += 1
+        if cells == None:
+            cells = self.cell_range(hitbox)
+        self.__link(item, tuple(cells))
+
+
+    def remove(self, item) -> None:
+        """Remove o item do hash (caso exista)"""
+        if item in self.__items:
+            self.__unlink(item)
+            del self.__order[item]
+
+
+    def update(self, item, hitbox) -> None:
+        """
+        Atualiza as células do item após seu hitbox ter sido alterado. Caso continue
+        nas mesmas células nada é feito.
+        """
+        cells = self.cell_range(hitbox)
+        if self.__items.get(item) == cells:
+            return
+
+        self.__unlink(item)
+        self.__link(item, cells)
+
+
+    def export(self) -> dict:
+        """
+        Retorna os arrays que descrevem o hash (itens inteiros): os itens na ordem de
+        inserção e seus intervalos de células ("items" e "item_cells"), e o conteúdo das
+        células em formato compacto ("cell_keys" com as células (i, j), e os itens de
+        cada célula em "cell_items"[cell_offsets[k]:cell_offsets[k+1]]).
+        """
+        items = list(self.__order)
+        keys  = sorted(self.__cells)
+        cell_items = [ sorted(self.__cells[key], key=self.__order.__getitem__) for key in keys ]
+
+        return {
+            "items":        np.array(items, dtype=np.int64),
+            "item_cells":   np.array([ self.__items[item] for item in items ], dtype=np.int64).reshape(-1, 4),
+            "cell_keys":    np.array(keys, dtype=np.int64).reshape(-1, 2),
+            "cell_offsets": np.cumsum([0] + [ len(bucket) for bucket in cell_items ], dtype=np.int64),
+            "cell_items":   np.array([ item for bucket in cell_items for item in bucket ], dtype=np.int64),
+        }
+
+
+    def load(self, arrays) -> None:
+        """Preenche o hash vazio com os arrays gerados por export()"""
+        items = arrays["items"].tolist()
+        self.__order = { item: index for index, item in enumerate(items) }
+        self.__counter = len(items)
+        self.__items = { item: tuple(cells) for item, cells in zip(items, arrays["item_cells"].tolist()) }
+
+        offsets, cell_items = arrays["cell_offsets"].tolist(), arrays["cell_items"].tolist()
+        self.__cells = { tuple(key): set(cell_items[offsets[k]:offsets[k+1]]) for k, key in enumerate(arrays["cell_keys"].tolist()) }
+
+
+    def query(self, hitbox) -> list:
+        """
+        Retorna os itens registrados nas células cobertas pelo hitbox informado, na
+        ordem de inserção. Os itens retornados são apenas candidatos, sendo necessário
+        verificar a colisão com Hitbox.check_collision.
+        """
+        cells = self.cell_range(hitbox)
+        found = set()
+        for i in range(cells[0], cells[2]+1):
+            for j in range(cells[1], cells[3]+1):
+                bucket = self.__cells.get((i, j))
+                if bucket:
+                    found |= bucket
+
+        return sorted(found, key=self.__order.__getitem__)
+
+
+    def __iter__(self):
+        return iter(self.__order)
+
+
+    def __len__(self) -> int:
+        return len(self.__order)
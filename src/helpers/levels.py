@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+import os
+import importlib
+import numpy as np
+
+from src.colliders.SpatialHash import SpatialHash
+from src.objects.GameObject import GameObject
+from src.helpers.vertex import build_vertex_buffer
+
+# Obs: arrays (arquivos .npy sem compressão) que formam um pacote de fase
+level_arrays = ("types", "vertices", "ranges", "shader_count", "groups", "position", "size", "rotate",
+                "solid", "hitboxes", "cells", "cell_size",
+                "broadphase_items", "broadphase_item_cells", "broadphase_cell_keys", "broadphase_cell_offsets", "broadphase_cell_items")
+
+
+def compile_level(scheme=[], path="level.pack", window_resolution=(600,600), cell_size=100) -> None:
+    """
+    Compila o esquema de uma fase (lista de tipos e itens, ver main.py) em um pacote que
+    pode ser carregado diretamente pelo GameController (ver load_level). O pacote é um
+    diretório com um arquivo .npy (sem compressão, mapeado da memória na leitura) para
+    cada array de `level_arrays`: o buffer de vértices final (float32) e o intervalo e
+    shader_count de cada tipo; o grupo, posição, tamanho e rotação de todos os itens; as
+    linhas dos itens sólidos, com seus hitboxes (box) e células; e o broadphase
+    (SpatialHash de `cell_size` pixels) já montado, com as linhas do mundo de colisões.
+
+    O pacote deve ser compilado novamente se os vértices ou hitboxes dos tipos mudarem.
+    """
+    vertices, ranges = build_vertex_buffer([ object["type"] for object in scheme ])
+    broadphase = SpatialHash(cell_size)
+
+    items = [ (group, item) for group, object in enumerate(scheme) for item in object["items"] ]
+    solid, hitboxes, cells = [], [], []
+    for row, (group, item) in enumerate(items):
+        # Hitboxes are calculated by the objects themselves
+        if item.get("props", {"hitbox": False})["hitbox"]:
+            instance = scheme[group]["type"](position=item["position"], size=item["size"], rotate=item["rotate"], window_resolution=window_resolution)
+            instance.configure_hitbox()
+            if instance.object_hitbox != None and instance.object_hitbox.type == "box":
+                broadphase.insert(len(solid), instance.object_hitbox)
+                solid.append(row)
+                hitboxes.append(instance.object_hitbox.box.copy())
+                cells.append(broadphase.cell_range(instance.object_hitbox))
+
+    arrays = {
+        "types":        np.array([ "{}:{}".format(object["type"].__module__, object["type"].__qualname__) for object in scheme ]),
+        "vertices":     vertices,
+        "ranges":       np.array(ranges, dtype=np.int64).reshape(-1, 2),
+        "shader_count": np.array([ object["type"].shader_count for object in scheme ], dtype=np.int64),
+        "groups":       np.array([ group for group, _ in items ], dtype=np.int64),
+        "position":     np.array([ item["position"] for _, item in items ], dtype=np.float64).reshape(-1, 2),
+        "size":         np.array([ item["size"] for _, item in items ], dtype=np.float64).reshape(-1, 2),
+        "rotate":       np.array([ item["rotate"] for _, item in items ], dtype=np.float64),
+        "solid":        np.array(solid, dtype=np.int64),
+        "hitboxes":     np.array(hitboxes, dtype=np.float64).reshape(-1, 4),
+        "cells":        np.array(cells, dtype=np.int64).reshape(-1, 4),
+        "cell_size":    np.array(cell_size, dtype=np.int64),
+    }
+    for name, values in broadphase.export().items():
+        arrays["broadphase_" + name] = values
+
+    os.makedirs(path, exist_ok=True)
+    for name in level_arrays:
+        np.save(os.path.join(path, name + ".npy"), arrays[name])
+
+
+def load_level(path="level.pack") -> dict:
+    """
+    Carrega um pacote de fase (ver compile_level), atualizando o shader_offset e o
+    shader_count dos tipos. Retorna os tipos e os arrays do pacote, mapeados da memória
+    (somente leitura), que são copiados diretamente para o TransformBuffer e o
+    CollisionWorld (ver GameController), e o broadphase no formato de SpatialHash.load.
+
+    Os tipos do pacote devem ser subclasses de GameObject definidas em `src.objects`,
+    caso contrário o pacote é rejeitado (ValueError) antes de criar qualquer objeto.
+    """
+    if not os.path.isdir(path) or not all(os.path.exists(os.path.join(path, name + ".npy")) for name in level_arrays):
+        raise ValueError("Pacote de fase inválido (compile novamente): {}".format(path))
+    level = { name: np.load(os.path.join(path, name + ".npy"), mmap_mode="r") for name in level_arrays }
+
+    types = []
+    for name in level["types"].tolist():
+        module, _, qualname = name.partition(":")
+        if not module.startswith("src.objects.") or qualname == "" or "." in qualname:
+            raise ValueError("Tipo de objeto inválido no pacote de fase {}: {}".format(path, name))
+        try:
+            object_type = getattr(importlib.import_module(module), qualname, None)
+        except ImportError:
+            object_type = None
+        if not isinstance(object_type, type) or not issubclass(object_type, GameObject):
+            raise ValueError("Tipo de objeto inválido no pacote de fase {}: {}".format(path, name))
+        types.append(object_type)
+
+    ranges = [ tuple(values) for values in level["ranges"].tolist() ]
+    for object_type, (offset, _), count in zip(types, ranges, level["shader_count"].tolist()):
+        object_type.shader_offset = offset
+        object_type.shader_count  = count
+
+    level["types"]      = types
+    level["ranges"]     = ranges
+    level["cell_size"]  = int(level["cell_size"])
+    level["broadphase"] = { name: level.pop("broadphase_" + name) for name in ("items", "item_cells", "cell_keys", "cell_offsets", "cell_items") }
+    return level
+
+
+def level_scheme(level) -> list:
+    """
+    Monta o esquema da fase (tipos e itens) a partir de um pacote carregado, com o
+    hitbox e as células já calculados em cada item sólido ("hitbox" e "cells"). Usado
+    apenas quando os objetos são criados a partir dos itens (Ex: chunks, ver ChunkedWorld).
+    """
+    scheme = [ { "type": object_type, "items": [] } for object_type in level["types"] ]
+    solid  = { row: index for index, row in enumerate(level["solid"].tolist()) }
+    hitboxes, cells = level["hitboxes"].tolist(), level["cells"].tolist()
+    for row, (group, position, size, rotate) in enumerate(zip(level["groups"].tolist(), level["position"].tolist(),
+                                                              level["size"].tolist(), level["rotate"].tolist())):
+        item = { "position": tuple(position), "size": tuple(size), "rotate": rotate, "props": { "hitbox": row in solid } }
+        if row in solid:
+            item["hitbox"] = hitboxes[solid[row]]
+            item["cells"]  = tuple(cells[solid[row]])
+        scheme[group]["items"].append(item)
+    return scheme
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+import os
+import numpy as np
+
+def generate_noise_texture(size=256, cache_dir=".cache") -> np.ndarray:
+    """
+    Gera os valores aleatórios da grade (size x size) usados pelo ruído do MagmaShader,
+    com o mesmo hash do shader (fract(sin(dot(i, vec2(12.9898, 78.233))) * 43758.5453123)).
+    Como a textura é usada com GL_REPEAT o ruído se repete a cada `size` unidades.
+
+    O resultado (float32) é salvo em `cache_dir` e reaproveitado nas próximas execuções.
+    """
+    path = os.path.join(cache_dir, "magma_noise_{}.npy".format(size))
+    if os.path.exists(path):
+        values = np.load(path)
+        if values.shape == (size, size) and values.dtype == np.float32:
+            return values
+
+    y, x = np.mgrid[0:size, 0:size].astype(np.float64)
+    values = np.sin(x*12.9898 + y*78.233) * 43758.5453123
+    values = (values - np.floor(values)).astype(np.float32)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    np.save(path, values)
+    return values
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import os
+import glob
+import hashlib
+import tempfile
+import numpy as np
+from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+
+def decode_texture(path, cache_dir=".cache") -> np.ndarray:
+    """
+    Decodifica a imagem no formato esperado pelo glTexImage2D (RGB com as linhas invertidas,
+    como image.tobytes("raw", "RGB", 0, -1)) e retorna um array (altura, largura, 3) uint8.
+
+    O resultado é salvo em `cache_dir` com o caminho, a data de modificação e o tamanho do
+    arquivo no nome, e nas próximas execuções é apenas mapeado da memória (mmap), sem ler
+    a imagem.
+    """
+    stat       = os.stat(path)
+    path_hash  = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:12]
+    cache_path = os.path.join(cache_dir, "texture-{}-{}-{}.npy".format(path_hash, stat.st_mtime_ns, stat.st_size))
+
+    if os.path.exists(cache_path):
+        try:
+            return np.load(cache_path, mmap_mode="r")
+        except FileNotFoundError:
+            pass
+
+    image  = Image.open(path).convert("RGB")
+    pixels = np.ascontiguousarray(np.asarray(image, dtype=np.uint8)[::-1])
+
+    # Replace old versions of the same file (saved in a unique temporary file to be atomic,
+    # as other threads or processes may be writing the same cache entry)
+    os.makedirs(cache_dir, exist_ok=True)
+    for old_path in glob.glob(os.path.join(cache_dir, "texture-{}-*.npy".format(path_hash))):
+        if old_path != cache_path:
+            try:
+                os.remove(old_path)
+            except FileNotFoundError:
+                pass
+    with tempfile.NamedTemporaryFile(dir=cache_dir, prefix=os.path.basename(cache_path) + ".", suffix=".tmp", delete=False) as file:
+        np.save(file, pixels)
+    os.replace(file.name, cache_path)
+    return pixels
+
+
+def decode_textures(paths=(), cache_dir=".cache", max_workers=8) -> list:
+    """
+    Decodifica (ou lê do cache) todas as imagens em paralelo, retornando os arrays na
+    mesma ordem dos caminhos informados (ver decode_texture).
+    """
+    if len(paths) == 0:
+        return []
+
+    # Each file is decoded only once, even if it is used by several objects
+    unique_paths = list(dict.fromkeys(paths))
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_paths))) as executor:
+        images = dict(zip(unique_paths, executor.map(lambda path: decode_texture(path, cache_dir), unique_paths)))
+    return [ images[path] for path in paths ]
+
+
+def pack_texture_layers(images=()) -> np.ndarray:
+    """
+    Junta as imagens decodificadas (ver decode_texture) em um único array (camadas, altura,
+    largura, 3) para ser enviado como uma GL_TEXTURE_2D_ARRAY. Como todas as camadas devem
+    ter o mesmo tamanho, as imagens menores são redimensionadas para o tamanho da maior.
+    """
+    height = max(image.shape[0] for image in images)
+    width  = max(image.shape[1] for image in images)
+
+    layers = np.zeros((len(images), height, width, 3), dtype=np.uint8)
+    for index, image in enumerate(images):
+        if image.shape[:2] != (height, width):
+            image = np.asarray(Image.fromarray(np.asarray(image)).resize((width, height), Image.LANCZOS))
+        layers[index] = image
+    return layers
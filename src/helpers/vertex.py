@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import numpy as np
 from functools import reduce
+from OpenGL.GL import GL_TRIANGLES, GL_TRIANGLE_FAN, GL_TRIANGLE_STRIP
 
 def generate_circle_vertexes(N=64, center=(0,0), radius=1.0) -> list:
     """
@@ -27,4 +28,44 @@ def generate_random_circle_vertexes(N=64, center=(0,0), radius=1.0, var=(-0.2, 0
         x = center[0] + (radius+perturb) * np.cos(2*i*np.pi/N)
         y = center[1] + (radius+perturb) * np.sin(2*i*np.pi/N)
         circle_points += [(x, y, 0.0)]
-    return circle_points
\ No newline at end of file
+    return circle_points
+
+
+def bake_colored_triangles(vertices=[], parts=[]) -> list:
+    """
+    Dado os vértices de um objeto composto e suas partes no formato (modo, primeiro 
+    vértice, quantidade, cor), converte cada parte em triângulos independentes
+    (GL_TRIANGLES) com a cor da parte em cada vértice (x, y, z, r, g, b, a). 
+    
+    A ordem das partes é mantida, permitindo desenhar todo o objeto em uma única chamada.
+    """
+    colored_triangles = []
+    for mode, first, count, color in parts:
+        part = [tuple(vertex) + tuple(color) for vertex in vertices[first:first+count]]
+        if mode == GL_TRIANGLE_FAN:
+            for i in range(1, count-1):
+                colored_triangles += [part[0], part[i], part[i+1]]
+        elif mode == GL_TRIANGLE_STRIP:
+            for i in range(0, count-2):
+                colored_triangles += [part[i], part[i+1], part[i+2]]
+        elif mode == GL_TRIANGLES:
+            colored_triangles += part
+    return colored_triangles
+
+
+def build_vertex_buffer(types=[]) -> tuple:
+    """
+    Gera os vértices de todos os tipos em um único array (V, 7) float32 no formato
+    (x, y, z, r, g, b, a), atualizando o shader_offset de cada tipo. Vértices sem cor
+    (x, y, z) recebem a cor branca.
+
+    Retorna o array e o intervalo (primeiro vértice, quantidade) de cada tipo.
+    """
+    vertices, ranges = [], []
+    for type in types:
+        type.shader_offset = len(vertices)
+        vertices += [ tuple(vertex) + (1.0, 1.0, 1.0, 1.0) if len(vertex) == 3 else tuple(vertex) 
+                        for vertex in type.get_vertices() ]
+        ranges.append((type.shader_offset, len(vertices) - type.shader_offset))
+
+    return np.array(vertices, dtype=np.float32).reshape(-1, 7), ranges
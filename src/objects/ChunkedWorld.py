@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+import math
+from collections import OrderedDict
+
+
+class ChunkedWorld:
+    """
+    Divide os itens do esquema da cena em chunks (células quadradas de `chunk_size`
+    pixels, pela posição inicial do centro de cada item) e mantém criados apenas os
+    objetos dos chunks ativos: os que estão a até `radius` chunks da região visível ou
+    de algum objeto âncora (tipos com `chunk_anchor = True`, como o robô).
+
+    Itens de tipos âncora e itens maiores que um chunk (Ex: o fundo) são globais e
+    ficam sempre carregados. Os chunks que deixam de ser ativos são mantidos em um cache
+    LRU de até `cache_size` chunks, preservando o estado dos seus objetos caso voltem a
+    ser ativos. Os mais antigos são descartados e seus objetos são criados novamente a
+    partir do esquema quando necessário.
+
+    Obs: um objeto sempre pertence ao chunk da sua posição inicial, mesmo que se mova.
+    """
+
+
+    def __init__(self, scheme, create, chunk_size=600, radius=1, cache_size=16) -> None:
+        """
+        Distribui os itens do esquema nos chunks e cria os objetos globais. A função
+        `create(object, item)` cria o objeto de um item do esquema (ver GameController).
+        """
+        self.chunk_size = chunk_size
+        self.radius     = radius
+        self.cache_size = cache_size
+        self.active     = set()
+        self.__scheme   = scheme
+        self.__create   = create
+        self.__chunks   = {}
+        self.__globals  = {}
+        self.__loaded   = OrderedDict()
+
+        for group_index, object in enumerate(scheme):
+            for item_index, item in enumerate(object["items"]):
+                if getattr(object["type"], "chunk_anchor", False) or max(item["size"]) > chunk_size:
+                    self.__globals[(group_index, item_index)] = create(object, item)
+                else:
+                    key = self.chunk_of(item["position"])
+                    self.__chunks.setdefault(key, []).append((group_index, item_index))
+
+
+    def chunk_of(self, position) -> tuple:
+        """Retorna o chunk (i, j) que contém a posição em pixels"""
+        return (math.floor(position[0] / self.chunk_size), math.floor(position[1] / self.chunk_size))
+
+
+    def anchors(self) -> list:
+        """Retorna os objetos âncora (que mantêm os chunks ao seu redor ativos)"""
+        return [ item for (group_index, _), item in self.__globals.items()
+                    if getattr(self.__scheme[group_index]["type"], "chunk_anchor", False) ]
+
+
+    def focus(self, regions=[]) -> bool:
+        """
+        Ativa os chunks próximos das regiões (x0, y0, x1, y1) em pixels informadas,
+        criando os objetos dos chunks que não estão no cache e descartando os chunks
+        inativos mais antigos. Retorna verdadeiro se os chunks ativos mudaram.
+        """
+        active = set()
+        for x0, y0, x1, y1 in regions:
+            i0, j0 = self.chunk_of((x0, y0))
+            i1, j1 = self.chunk_of((x1, y1))
+            for i in range(i0 - self.radius, i1 + self.radius + 1):
+                for j in range(j0 - self.radius, j1 + self.radius + 1):
+                    if (i, j) in self.__chunks:
+                        active.add((i, j))
+
+        if active == self.active:
+            return False
+
+        # Load (or reuse from the cache) the active chunks, marking them as recently used
+        for key in sorted(active):
+            if key not in self.__loaded:
+                self.__loaded[key] = { index: self.__create(self.__scheme[index[0]], self.__scheme[index[0]]["items"][index[1]])
+                                        for index in self.__chunks[key] }
+            self.__loaded.move_to_end(key)
+        self.active = active
+
+        # Evict the least recently used inactive chunks
+        inactive = [ key for key in self.__loaded if key not in active ]
+        for key in inactive[:max(0, len(inactive) - self.cache_size)]:
+            del self.__loaded[key]
+        return True
+
+
+    def groups(self) -> list:
+        """
+        Retorna, para cada grupo do esquema, a lista de pares (objeto, item do esquema)
+        globais ou dos chunks ativos, na ordem original dos itens.
+        """
+        loaded = dict(self.__globals)
+        for key in self.active:
+            loaded.update(self.__loaded[key])
+
+        groups = [ [] for _ in self.__scheme ]
+        for group_index, item_index in sorted(loaded):
+            groups[group_index].append((loaded[(group_index, item_index)], self.__scheme[group_index]["items"][item_index]))
+        return groups
@@ -15,6 +15,14 @@ class GameObject:
 
     A criação do programa de Shader e declaração dos vértices é feita apenas uma vez por meio
     de atributos e métodos estáticos (pertencentes à classe).
+
+    Tipos com `static = True` nunca se movem após serem criados e são desenhados uma única
+    vez na camada estática da cena (ver GameController). Os estáticos com vértices em
+    triângulos coloridos (`shader_count` > 0) são desenhados a partir de um buffer já
+    transformado (ver StaticBatch), ao invés dos seus métodos de desenho.
+
+    Tipos com `chunk_anchor = True` ficam sempre carregados e mantêm ativos os chunks da
+    fase ao seu redor quando ela é dividida em chunks (ver ChunkedWorld).
     """
 
     shader_program  = Shader(vertex_code, fragment_code)
@@ -25,8 +33,11 @@ class GameObject:
         ( 1.0,   1.0,  0.0),
         ( 1.0,  -1.0,  0.0),
     ]
+    shader_count    = 0
     shader_textures = []
-    shader_textures_ids = []
+    shader_textures_layers = []
+    static    = False
+    chunk_anchor = False
 
 
     def get_vertices():
@@ -37,6 +48,24 @@ class GameObject:
         return GameObject.shader_vertices
 
 
+    def set_quality(settings={}) -> bool:
+        """
+        Ajusta os recursos mais custosos do tipo ao nível de qualidade informado (ver 
+        QualityGovernor). Retorna verdadeiro caso os vértices do tipo tenham mudado e o 
+        buffer de vértices precise ser reconstruído.
+        """
+        return False
+
+
+    def prepare_draw(items=[]):
+        """
+        Chamado uma vez por frame antes do grupo do tipo ser desenhado (e antes do seu shader
+        ser ativado), permitindo preparar recursos compartilhados por todos os itens, como 
+        desenhar em uma textura fora da tela.
+        """
+        pass
+
+
     def __init__(self, position=(0,0), size=(200,200), rotate=0, window_resolution=(600,600)) -> None:
         """
         Cria um objeto básico com as configurações de posicionamento informadas. a conversão
@@ -53,27 +82,98 @@ class GameObject:
         window_resolution: dupla de inteiros
             Representa o tamanho atual da tela (necessário para realizar algumas conversões)
         """
-        self.position = [position[0], position[1]]                   
-        self.size = np.array([size[0], size[1]], dtype=np.float)
-        self.rotate = rotate
+        # Own storage until the object is registered in a TransformBuffer
+        self._transform_buffer = None
+        self._transform_row = None
+        self._position = np.array([position[0], position[1]], dtype=np.float64)
+        self._size     = np.array([size[0], size[1]], dtype=np.float64)
+        self._rotate   = np.array([rotate], dtype=np.float64)
+        self._model_matrix = None
         self.window_resolution = window_resolution
 
         self._gl_scale = [0.0, 0.0]
         self._gl_rotate = [0.0]
         self._gl_translate = [0.0, 0.0]
+        self._gl_state = None
+        self._matrix_dirty = True
 
         self.object_hitbox = None
 
         self._configure_gl_variables()
 
 
+    @property
+    def position(self) -> np.ndarray:
+        """Posição (x, y) em pixels do centro do objeto"""
+        return self._position
+
+    @position.setter
+    def position(self, value) -> None:
+        self._position[:] = value
+        self._mark_dirty()
+
+
+    @property
+    def size(self) -> np.ndarray:
+        """Tamanho (width, height) em pixels do objeto"""
+        return self._size
+
+    @size.setter
+    def size(self, value) -> None:
+        self._size[:] = value
+        self._mark_dirty()
+
+
+    @property
+    def rotate(self) -> float:
+        """Rotação do objeto em graus"""
+        return self._rotate[0]
+
+    @rotate.setter
+    def rotate(self, value) -> None:
+        self._rotate[0] = value
+        self._mark_dirty()
+
+
+    def _bind_transform(self, buffer, row) -> None:
+        """
+        Passa a armazenar a posição, tamanho e rotação na linha `row` do TransformBuffer,
+        que também calcula a matriz model do objeto a cada quadro.
+        """
+        if self._transform_buffer != buffer:
+            buffer.position[row] = self._position
+            buffer.size[row]     = self._size
+            buffer.rotate[row]   = self._rotate[0]
+
+        self._transform_buffer = buffer
+        self._transform_row = row
+        self._position = buffer.position[row]
+        self._size     = buffer.size[row]
+        self._rotate   = buffer.rotate[row:row+1]
+        self._model_matrix = buffer.model[row]
+
+
+    def _mark_dirty(self) -> None:
+        """Marca que a matriz model do objeto precisa ser recalculada"""
+        self._matrix_dirty = True
+        if self._transform_buffer != None:
+            self._transform_buffer.touch(self._transform_row)
+
+
     def _configure_gl_variables(self):
         """
         Atualiza as variáveis utilizadas para renderização (__gl_*) baseado nos valores
-        das variáveis públicas. 
+        das variáveis públicas. Deve ser chamado após alterar a posição, tamanho ou rotação
+        pelos índices (ex: self.position[0] += 1), e não faz nada se nenhum deles mudou.
         
         Ex: posicao (300, 450) -> (0.0, 0.5) em uma tela de 600x600
         """
+        state = (self._position[0], self._position[1], self._size[0], self._size[1], self._rotate[0])
+        if state == self._gl_state:
+            return
+
+        self._gl_state = state
+        self._mark_dirty()
         self._gl_scale[0] = self.size[0]/self.window_resolution[0]
         self._gl_scale[1] = self.size[1]/self.window_resolution[1]
         self._gl_rotate   = self.rotate*(np.pi/180.0)
@@ -94,6 +194,59 @@ class GameObject:
         ]
 
 
+    def _get_model_matrix(self) -> np.ndarray:
+        """
+        Retorna a matriz model (float32) do objeto. Se o objeto pertence a um TransformBuffer
+        retorna a matriz já calculada em lote para o quadro atual.
+        """
+        if self._transform_buffer != None:
+            return self._model_matrix
+
+        if self._matrix_dirty or self._model_matrix is None:
+            self._model_matrix = np.array(self._generate_model_matrix(), np.float32)
+            self._matrix_dirty = False
+
+        return self._model_matrix
+
+
+    def snapshot(self) -> dict:
+        """
+        Retorna uma cópia do estado próprio do objeto (atributos alterados pela lógica, 
+        como direções e flags), usada para reiniciar a fase sem recriar o objeto (ver 
+        restore). Posição, tamanho e rotação ficam no TransformBuffer, que tem o seu
+        próprio snapshot, e do hitbox são copiados apenas os valores.
+        """
+        state = {}
+        for name, value in self.__dict__.items():
+            if name in ("_transform_buffer", "_transform_row", "_position", "_size", "_rotate", "_model_matrix", "window_resolution"):
+                continue
+            if name == "object_hitbox":
+                value = None if value == None else (value, value.box.copy())
+            elif isinstance(value, np.ndarray) or isinstance(value, list):
+                value = value.copy()
+            state[name] = value
+        return state
+
+
+    def restore(self, state) -> None:
+        """
+        Volta o objeto ao estado salvo pelo snapshot. Arrays e listas são copiados para
+        os já existentes (assim como os valores do hitbox), mantendo as referências.
+        """
+        for name, value in state.items():
+            current = self.__dict__.get(name)
+            if name == "object_hitbox":
+                if value != None:
+                    value[0].box[:] = value[1]
+                    value = value[0]
+            elif isinstance(value, np.ndarray) and isinstance(current, np.ndarray) and current.shape == value.shape:
+                current[...] = value
+                continue
+            elif isinstance(value, list):
+                value = value.copy()
+            self.__dict__[name] = value
+
+
     def configure_hitbox(self) -> None:
         """
         Permite que certor objetos tenham um objeto hitbox configurado e instânciado
@@ -109,7 +262,7 @@ class GameObject:
         de posição, rotação e tamanho do objeto.
         """
         # Prepare the model transformation matrix
-        model_matrix = np.array(self._generate_model_matrix(), np.float32)
+        model_matrix = self._get_model_matrix()
 
         # Send final matrix to the GPU unit
         GameObject.shader_program.set4fMatrix('u_model_matrix', model_matrix)
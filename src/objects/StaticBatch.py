@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+import numpy as np
+from OpenGL.GL import *
+
+from src.shaders.Shader import Shader
+from src.shaders.BaseShader import vertex_code, fragment_code
+
+
+class StaticBatch:
+    """
+    Agrupa os objetos estáticos da cena (tipos com `static = True`, que nunca se movem
+    após serem criados) em um único buffer de vértices já transformados na CPU para as
+    coordenadas da tela. Grupos estáticos consecutivos na ordem de desenho são então
+    desenhados com uma única chamada, usando a matriz identidade.
+
+    Apenas os tipos estáticos que geram seus vértices em triângulos (GL_TRIANGLES) com
+    as cores por vértice (ver helpers.vertex.bake_colored_triangles) e informam o número
+    de vértices em `shader_count` entram no batch. Os demais grupos são mantidos.
+
+    O batch deve ser reconstruído sempre que os objetos forem recriados (restart).
+    """
+
+
+    def __init__(self) -> None:
+        """Cria o programa e o buffer do batch (necessita do contexto da tela)"""
+        self.vertices = np.zeros((0, 7), dtype=np.float32)
+        self.shader_program = Shader(vertex_code, fragment_code)
+        self.shader_program.compile()
+        self.__buffer = glGenBuffers(1)
+
+
+    def build(self, groups, vertices, transforms) -> list:
+        """
+        Pré-transforma os itens dos grupos estáticos e envia o buffer para a GPU.
+
+        Recebe os grupos na ordem de desenho, os vértices de todos os tipos (formato
+        x, y, z, r, g, b, a) e o TransformBuffer da cena. Retorna a mesma lista de grupos
+        com cada sequência de grupos estáticos trocada por um passo {"batch": (primeiro
+        vértice, quantidade)}, que deve ser desenhado com draw().
+        """
+        transforms.compute(1.0)
+
+        steps, parts, count = [], [], 0
+        for group in groups:
+            if not group["type"].static or group["type"].shader_count == 0:
+                steps.append(group)
+                continue
+            if len(group["items"]) == 0:
+                continue
+
+            # Transform each item vertices: (N, 4, 4) x (V, 4) -> (N, V, 4)
+            first_row, last_row = group["rows"]
+            offset, size = group["type"].shader_offset, group["type"].shader_count
+            local = vertices[offset:offset+size].astype(np.float64)
+            model = transforms.model[first_row:last_row].astype(np.float64)
+
+            positions = np.concatenate([local[:, :3], np.ones((size, 1))], axis=1)
+            world  = np.einsum("nij,vj->nvi", model, positions)
+            colors = np.broadcast_to(local[:, 3:], (len(model), size, 4))
+            parts.append(np.concatenate([world[:, :, :3], colors], axis=2).reshape(-1, 7))
+
+            # Consecutive static groups share the same draw call
+            if len(steps) > 0 and "batch" in steps[-1]:
+                first, total = steps[-1]["batch"]
+                steps[-1]["batch"] = (first, total + len(parts[-1]))
+            else:
+                steps.append({"batch": (count, len(parts[-1]))})
+            count += len(parts[-1])
+
+        self.vertices = np.concatenate(parts).astype(np.float32) if len(parts) > 0 else np.zeros((0, 7), dtype=np.float32)
+        if len(self.vertices) > 0:
+            glBindBuffer(GL_ARRAY_BUFFER, self.__buffer)
+            glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices, GL_STATIC_DRAW)
+
+        return steps
+
+
+    def draw(self, first, count) -> None:
+        """Desenha o intervalo de vértices do batch em uma única chamada"""
+        self.shader_program.use(self.__buffer)
+        self.shader_program.set4fMatrix('u_model_matrix', np.identity(4, dtype=np.float32))
+        self.shader_program.set4Float('u_color', [1.0, 1.0, 1.0, 1.0])
+        glDrawArrays(GL_TRIANGLES, first, count)
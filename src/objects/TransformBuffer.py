@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+import zlib
+import numpy as np
+
+
+class TransformBuffer:
+    """
+    Armazena a posição, tamanho e rotação de todos os objetos da cena em arrays numpy
+    contíguos e calcula as matrizes model de todos eles em uma única passada vetorizada,
+    dentro de um buffer (N, 4, 4) float32 pré-alocado.
+
+    Os atributos position, size e rotate dos objetos registrados passam a ser views das
+    suas linhas (ver GameObject._bind_transform), então a lógica dos objetos continua
+    alterando os valores normalmente.
+
+    O estado da iteração anterior também é mantido para que as matrizes possam ser
+    interpoladas entre duas iterações da lógica (ver GameController.start).
+
+    Apenas as linhas marcadas como alteradas (touch) são recalculadas, então objetos
+    estáticos têm sua matriz calculada uma única vez.
+    """
+
+
+    def __init__(self, window_resolution=(600,600), capacity=64) -> None:
+        """Cria o buffer vazio com a capacidade inicial informada"""
+        self.window_resolution = window_resolution
+        self.count = 0
+        self.__owners = []
+        self.__allocate(capacity)
+
+
+    def __allocate(self, capacity) -> None:
+        """(Re)aloca os arrays mantendo as linhas já utilizadas (as matrizes são recalculadas)"""
+        names = ("position", "size", "rotate", "previous_position", "previous_size", "previous_rotate", "interpolating")
+        old   = { name: getattr(self, name) for name in names } if self.count > 0 else {}
+
+        self.position = np.zeros((capacity, 2), dtype=np.float64)
+        self.size     = np.zeros((capacity, 2), dtype=np.float64)
+        self.rotate   = np.zeros(capacity, dtype=np.float64)
+        self.previous_position = np.zeros((capacity, 2), dtype=np.float64)
+        self.previous_size     = np.zeros((capacity, 2), dtype=np.float64)
+        self.previous_rotate   = np.zeros(capacity, dtype=np.float64)
+        self.model = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self.model[:, 2, 2] = 1.0
+        self.model[:, 3, 3] = 1.0
+        self.dirty = np.ones(capacity, dtype=bool)
+        self.interpolating = np.zeros(capacity, dtype=bool)
+
+        for name, values in old.items():
+            getattr(self, name)[:self.count] = values[:self.count]
+
+        for row, item in enumerate(self.__owners):
+            item._bind_transform(self, row)
+
+
+    def insert(self, item) -> int:
+        """Registra o objeto no buffer e retorna a linha ocupada por ele"""
+        if self.count >= len(self.rotate):
+            self.__allocate(2*len(self.rotate))
+
+        row = self.count
+        self.count += 1
+        self.__owners.append(item)
+        item._bind_transform(self, row)
+
+        # Without a previous iteration the previous state is the current one
+        self.previous_position[row] = self.position[row]
+        self.previous_size[row]     = self.size[row]
+        self.previous_rotate[row]   = self.rotate[row]
+        self.touch(row)
+        return row
+
+
+    def load(self, items, position, size, rotate) -> None:
+        """
+        Preenche o buffer vazio com os objetos informados (uma linha por objeto, nesta
+        ordem), copiando a posição, tamanho e rotação de todos de uma vez (Ex: pacotes
+        de fase, ver helpers.levels). Equivale a inserir os objetos um a um.
+        """
+        count = len(items)
+        self.__allocate(max(count, len(self.rotate)))
+        self.position[:count] = position
+        self.size[:count]     = size
+        self.rotate[:count]   = rotate
+        self.previous_position[:count] = position
+        self.previous_size[:count]     = size
+        self.previous_rotate[:count]   = rotate
+        self.dirty[:count] = True
+        self.interpolating[:count] = True
+
+        self.count = count
+        self.__owners = list(items)
+        for row, item in enumerate(items):
+            item._bind_transform(self, row)
+
+
+    def snapshot(self) -> tuple:
+        """Retorna uma cópia da posição, tamanho e rotação atuais de todos os objetos"""
+        n = self.count
+        return (self.position[:n].copy(), self.size[:n].copy(), self.rotate[:n].copy())
+
+
+    def restore(self, snapshot) -> None:
+        """
+        Volta os objetos ao estado do snapshot (sem interpolar a partir do estado atual).
+        Apenas as linhas que mudaram são marcadas como alteradas.
+        """
+        n = self.count
+        position, size, rotate = snapshot
+        changed = (self.position[:n] != position).any(axis=1) | (self.size[:n] != size).any(axis=1) | (self.rotate[:n] != rotate)
+
+        self.position[:n] = position
+        self.size[:n]     = size
+        self.rotate[:n]   = rotate
+        self.previous_position[:n] = position
+        self.previous_size[:n]     = size
+        self.previous_rotate[:n]   = rotate
+        self.dirty[:n] |= changed
+
+
+    def checksum(self) -> int:
+        """Hash (crc32) da posição, tamanho e rotação atuais de todos os objetos"""
+        n = self.count
+        value = zlib.crc32(self.position[:n].tobytes())
+        value = zlib.crc32(self.size[:n].tobytes(), value)
+        return zlib.crc32(self.rotate[:n].tobytes(), value)
+
+
+    def touch(self, row) -> None:
+        """Marca que o estado da linha foi alterado na iteração atual"""
+        self.dirty[row] = True
+        self.interpolating[row] = True
+
+
+    def changed_rows(self) -> np.ndarray:
+        """Linhas que serão recalculadas no próximo compute (alteradas ou interpoladas)"""
+        n = self.count
+        return np.flatnonzero(self.dirty[:n] | self.interpolating[:n])
+
+
+    def save_previous(self) -> None:
+        """Guarda o estado atual de todos os objetos antes de uma iteração da lógica"""
+        n = self.count
+        self.previous_position[:n] = self.position[:n]
+        self.previous_size[:n]     = self.size[:n]
+        self.previous_rotate[:n]   = self.rotate[:n]
+
+        # Rows drawn interpolated must be computed again at their final state
+        self.dirty[:n] |= self.interpolating[:n]
+        self.interpolating[:n] = False
+
+
+    def compute(self, alpha=1.0) -> None:
+        """
+        Calcula as matrizes model (Translate * Scale * Rotate) dos objetos alterados,
+        interpolando entre o estado anterior (alpha = 0) e o atual (alpha = 1).
+        """
+        rows = self.changed_rows()
+        if len(rows) == 0:
+            return
+
+        position, size, rotate = self.position[rows], self.size[rows], self.rotate[rows]
+        if alpha < 1.0:
+            # Rotation interpolates by the shortest arc
+            previous_position, previous_size, previous_rotate = self.previous_position[rows], self.previous_size[rows], self.previous_rotate[rows]
+            delta_rotate = ((rotate - previous_rotate + 180.0) % 360.0) - 180.0
+            position = previous_position + alpha * (position - previous_position)
+            size     = previous_size + alpha * (size - previous_size)
+            rotate   = previous_rotate + alpha * delta_rotate
+
+        half_width  = 0.5*self.window_resolution[0]
+        half_height = 0.5*self.window_resolution[1]
+        scale_x = size[:, 0] / self.window_resolution[0]
+        scale_y = size[:, 1] / self.window_resolution[1]
+        radians = rotate * (np.pi/180.0)
+        cos, sin = np.cos(radians), np.sin(radians)
+
+        self.model[rows, 0, 0] = scale_x * cos
+        self.model[rows, 0, 1] = scale_x * -sin
+        self.model[rows, 0, 3] = (position[:, 0] - half_width) / half_width
+        self.model[rows, 1, 0] = scale_y * sin
+        self.model[rows, 1, 1] = scale_y * cos
+        self.model[rows, 1, 3] = (position[:, 1] - half_height) / half_height
+        self.dirty[rows] = False
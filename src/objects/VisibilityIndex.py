@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+import numpy as np
+
+from src.colliders.Hitbox import Hitbox
+from src.colliders.SpatialHash import SpatialHash
+
+
+class VisibilityIndex:
+    """
+    Índice espacial usado para desenhar apenas os objetos visíveis (culling). Mantém os
+    limites de cada objeto da cena em pixels (AABB [x, y, w, h] do objeto rotacionado,
+    a partir da posição, tamanho e rotação do TransformBuffer) e um SpatialHash por
+    grupo de objetos, então a consulta da região visível custa proporcionalmente às
+    células visíveis, e não ao tamanho da fase.
+
+    Os limites locais de cada tipo (maior |x| e |y| dos seus vértices, que em geral
+    ficam em [-1, 1]) são informados na construção. Como os objetos são desenhados
+    interpolados entre duas iterações da lógica, os limites englobam os dois estados.
+
+    O índice deve ser reconstruído sempre que os objetos forem recriados (restart) ou
+    os vértices dos tipos mudarem.
+    """
+
+
+    def __init__(self, groups, transforms, vertex_bounds, cell_size=200) -> None:
+        """
+        Cria o índice dos grupos de objetos da cena (com os itens e o intervalo de linhas
+        no TransformBuffer `transforms`). `vertex_bounds` relaciona cada tipo aos seus
+        limites locais (x, y).
+        """
+        self.transforms = transforms
+        self.boxes = np.zeros((transforms.count, 4), dtype=np.float64)
+        self.__local_bounds = np.ones((transforms.count, 2), dtype=np.float64)
+        self.__hitboxes = []
+        self.__hashes = {}
+        self.__row_hashes = [None] * transforms.count
+
+        for group in groups:
+            first_row, last_row = group["rows"]
+            self.__local_bounds[first_row:last_row] = vertex_bounds.get(group["type"], (1.0, 1.0))
+        self.__compute(np.arange(transforms.count))
+
+        # Rows are inserted in order, so the queries keep the draw order of the items
+        for row in range(transforms.count):
+            self.__hitboxes.append(Hitbox("box", self.boxes[row]))
+            self.__hitboxes[row].bind(self.boxes[row], row)
+        for group in groups:
+            spatial_hash = SpatialHash(cell_size)
+            for row in range(*group["rows"]):
+                spatial_hash.insert(row, self.__hitboxes[row])
+                self.__row_hashes[row] = spatial_hash
+            self.__hashes[group["rows"]] = spatial_hash
+
+
+    def __compute(self, rows) -> None:
+        """Calcula os limites (união do estado atual e anterior) das linhas informadas"""
+        bounds = self.__local_bounds[rows]
+        x0, y0, x1, y1 = None, None, None, None
+        for position, size, rotate in ((self.transforms.position, self.transforms.size, self.transforms.rotate),
+                                       (self.transforms.previous_position, self.transforms.previous_size, self.transforms.previous_rotate)):
+            # Half extents of the rotated (then scaled) local bounds
+            radians  = rotate[rows] * (np.pi/180.0)
+            cos, sin = np.abs(np.cos(radians)), np.abs(np.sin(radians))
+            half_width  = 0.5 * size[rows, 0] * (cos*bounds[:, 0] + sin*bounds[:, 1])
+            half_height = 0.5 * size[rows, 1] * (sin*bounds[:, 0] + cos*bounds[:, 1])
+
+            left,  bottom = position[rows, 0] - half_width, position[rows, 1] - half_height
+            right, top    = position[rows, 0] + half_width, position[rows, 1] + half_height
+            x0 = left   if x0 is None else np.minimum(x0, left)
+            y0 = bottom if y0 is None else np.minimum(y0, bottom)
+            x1 = right  if x1 is None else np.maximum(x1, right)
+            y1 = top    if y1 is None else np.maximum(y1, top)
+
+        self.boxes[rows, 0] = x0
+        self.boxes[rows, 1] = y0
+        self.boxes[rows, 2] = x1 - x0
+        self.boxes[rows, 3] = y1 - y0
+
+
+    def update(self) -> None:
+        """
+        Atualiza os limites e as células dos objetos alterados desde o último cálculo
+        das matrizes (deve ser chamado antes de TransformBuffer.compute).
+        """
+        rows = self.transforms.changed_rows()
+        if len(rows) == 0:
+            return
+
+        self.__compute(rows)
+        for row in rows.tolist():
+            if self.__row_hashes[row] != None:
+                self.__row_hashes[row].update(row, self.__hitboxes[row])
+
+
+    def visible(self, group, region) -> tuple:
+        """
+        Retorna os itens do grupo cujos limites intersectam a região (Hitbox do tipo box
+        [x, y, w, h] em pixels), na ordem de desenho, e as suas linhas no TransformBuffer.
+        Se todos os itens estão visíveis retorna a lista original e None no lugar das linhas.
+        """
+        first_row, last_row = group["rows"]
+        rows = np.array(self.__hashes[group["rows"]].query(region), dtype=np.intp)
+
+        x, y, w, h = region.box.tolist()
+        boxes = self.boxes[rows]
+        rows  = rows[(x < boxes[:, 0] + boxes[:, 2]) & (x + w > boxes[:, 0]) &
+                     (y < boxes[:, 1] + boxes[:, 3]) & (y + h > boxes[:, 1])]
+
+        if len(rows) == last_row - first_row:
+            return group["items"], None
+        return [group["items"][row - first_row] for row in rows.tolist()], rows
@@ -22,8 +22,11 @@ class BackgroundObject(GameObject):
         ( 1.0,  -1.0,  0.0),
     ]
     shader_textures = ["assets/object_ground_1.jpg"]
-    shader_textures_ids = []
+    shader_textures_layers = []
     subscribe_keys = []
+    static = True
+    pattern_repeat = [12, 6]
+    base_pattern_repeat = [12, 6]
     
 
     def get_vertices():
@@ -31,6 +34,13 @@ class BackgroundObject(GameObject):
         return BackgroundObject.shader_vertices
 
 
+    def set_quality(settings={}) -> bool:
+        """Aplica a quantidade de repetições da textura do fundo (ver QualityGovernor)"""
+        factor = settings.get("pattern_repeat", 1.0)
+        BackgroundObject.pattern_repeat = [ max(1, round(value * factor)) for value in BackgroundObject.base_pattern_repeat ]
+        return False
+
+
     def __init__(self, position=(0,0), size=(200,200), rotate=0, window_resolution=(600,600)) -> None:
         super().__init__(position=position, size=size, rotate=rotate, window_resolution=window_resolution)
 
@@ -38,15 +48,15 @@ class BackgroundObject(GameObject):
     def draw(self):
         """Desenha o objeto na tela"""
         # Prepare the model transformation matrix
-        model_matrix = np.array(self._generate_model_matrix(), np.float32)
+        model_matrix = self._get_model_matrix()
 
         # Send final matrix to the GPU unit
         BackgroundObject.shader_program.set4fMatrix('u_model_matrix', model_matrix)
-        BackgroundObject.shader_program.set2Float('u_pattern_repeat', [12,6])
+        BackgroundObject.shader_program.set2Float('u_pattern_repeat', BackgroundObject.pattern_repeat)
         BackgroundObject.shader_program.setFloat('u_opacity', 0.25)
 
-        # Set Texture id
-        glBindTexture(GL_TEXTURE_2D, BackgroundObject.shader_textures_ids[0])
+        # Set Texture layer
+        BackgroundObject.shader_program.setFloat('u_layer', BackgroundObject.shader_textures_layers[0])
 
         BackgroundObject.shader_program.set4Float('u_color',[0.93, 0.93, 0.93, 1.0])
         glDrawArrays(GL_TRIANGLE_STRIP, BackgroundObject.shader_offset + 0, 4)
\ No newline at end of file
@@ -6,6 +6,7 @@ import glfw
 
 from src.shaders.Shader import Shader
 from src.shaders.BaseShader import vertex_code, fragment_code
+from src.helpers.vertex import bake_colored_triangles
 from src.objects.GameObject import GameObject
 from src.colliders.Hitbox import Hitbox
 
@@ -43,11 +44,22 @@ class BoxObject(GameObject):
         ( 0.9 , -0.95 , 0.0),
         ( 0.9 , -0.75 , 0.0),
     ]
+    shader_parts = [
+        (GL_TRIANGLE_STRIP, 0,  4, [ 0.478, 0.47, 0.419, 1.0]),  # perfil
+        (GL_TRIANGLE_STRIP, 4,  4, [ 0.556, 0.933, 0.772, 1.0]), # contorno interno
+        (GL_TRIANGLE_STRIP, 8,  5, [ 0.427, 0.443, 0.384, 1.0]), # contorno diagonal interna
+        # (GL_TRIANGLE_STRIP, 13, 4, [ 0.0, 0.0, 0.0, 0.3]),     # sombra
+        (GL_TRIANGLE_STRIP, 17, 4, [ 0.427, 0.443, 0.384, 1.0]), # detalhe
+    ]
+    shader_count   = 0
     subscribe_keys = []
+    static = True
 
     def get_vertices():
-        """Geração dos vértices da Caixa"""
-        return BoxObject.shader_vertices
+        """Geração dos vértices da Caixa (partes convertidas em triângulos coloridos)"""
+        vertices = bake_colored_triangles(BoxObject.shader_vertices, BoxObject.shader_parts)
+        BoxObject.shader_count = len(vertices)
+        return vertices
 
 
     def __init__(self, position=(0,0), size=(200,200), rotate=0, window_resolution=(600,600)) -> None:
@@ -66,28 +78,14 @@ class BoxObject(GameObject):
 
 
     def draw(self):
-        """Desenha o objeto na tela"""
+        """Desenha o objeto na tela (todas as partes de uma vez, as cores estão nos vértices)"""
         # Prepare the model transformation matrix
-        model_matrix = np.array(self._generate_model_matrix(), np.float32)
+        model_matrix = self._get_model_matrix()
 
         # Send final matrix to the GPU unit
         BoxObject.shader_program.set4fMatrix('u_model_matrix', model_matrix)
-        
-        # Draw object steps
-        BoxObject.shader_program.set4Float('u_color',[ 0.478, 0.47, 0.419, 1.0])
-        glDrawArrays(GL_TRIANGLE_STRIP, BoxObject.shader_offset+0, 4) # perfil
-
-        BoxObject.shader_program.set4Float('u_color',[ 0.556, 0.933, 0.772, 1.0])
-        glDrawArrays(GL_TRIANGLE_STRIP, BoxObject.shader_offset+4, 4) # contorno interno
-
-        BoxObject.shader_program.set4Float('u_color',[ 0.427, 0.443, 0.384, 1.0])
-        glDrawArrays(GL_TRIANGLE_STRIP, BoxObject.shader_offset+8, 5) # contorno diagonal interna
-
-        # BoxObject.shader_program.set4Float('u_color',[ 0.0, 0.0, 0.0, 0.3])
-        # glDrawArrays(GL_TRIANGLE_STRIP, BoxObject.shader_offset+13, 4) # sombra
-        
-        BoxObject.shader_program.set4Float('u_color',[ 0.427, 0.443, 0.384, 1.0])
-        glDrawArrays(GL_TRIANGLE_STRIP, BoxObject.shader_offset+17, 4) # detalhe
+        BoxObject.shader_program.set4Float('u_color',[1.0, 1.0, 1.0, 1.0])
+        glDrawArrays(GL_TRIANGLES, BoxObject.shader_offset, BoxObject.shader_count)
 
 
     def logic(self, keys={}, buttons={}, objects=[]) -> None:
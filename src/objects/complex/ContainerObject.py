@@ -6,6 +6,7 @@ import glfw
 
 from src.shaders.Shader import Shader
 from src.shaders.BaseShader import vertex_code, fragment_code
+from src.helpers.vertex import bake_colored_triangles
 from src.objects.GameObject import GameObject
 from src.colliders.Hitbox import Hitbox
 
@@ -74,12 +75,20 @@ class ContainerObject(GameObject):
         (+0.625, +0.15, 0.0),
         (+0.625, -0.25, 0.0)
     ]
+    shader_parts = [(GL_TRIANGLE_STRIP, 0, 4, [0.729, 0.596, 0.592, 1.0])] + [ # container
+        (GL_TRIANGLE_STRIP, first, count, [0.882, 0.835, 0.921, 1.0])            # K, N, G
+            for first, count in [(4,4), (8,6), (14,4), (18,4), (22,4), (26,4), (30,4), (34,4), (38,4), (42,4)]
+    ]
+    shader_count   = 0
     subscribe_keys = []
+    static = True
     
 
     def get_vertices():
-        """Geração dos vértices do Robo"""
-        return ContainerObject.shader_vertices
+        """Geração dos vértices do Robo (partes convertidas em triângulos coloridos)"""
+        vertices = bake_colored_triangles(ContainerObject.shader_vertices, ContainerObject.shader_parts)
+        ContainerObject.shader_count = len(vertices)
+        return vertices
 
 
     def __init__(self, position=(0,0), size=(200,200), rotate=0, window_resolution=(600,600)) -> None:
@@ -100,28 +109,14 @@ class ContainerObject(GameObject):
 
 
     def draw(self):
-        """Desenha o objeto na tela"""
+        """Desenha o objeto na tela (todas as partes de uma vez, as cores estão nos vértices)"""
         # Prepare the model transformation matrix
-        model_matrix = np.array(self._generate_model_matrix(), np.float32)
+        model_matrix = self._get_model_matrix()
 
         # Send final matrix to the GPU unit
         ContainerObject.shader_program.set4fMatrix('u_model_matrix', model_matrix)
-        
-        # Draw object steps
-        ContainerObject.shader_program.set4Float('u_color',[0.729, 0.596, 0.592, 1.0])
-        glDrawArrays(GL_TRIANGLE_STRIP, ContainerObject.shader_offset + 0, 4) # container
-
-        ContainerObject.shader_program.set4Float('u_color',[0.882, 0.835, 0.921, 1.0])
-        glDrawArrays(GL_TRIANGLE_STRIP, ContainerObject.shader_offset + 4, 4) # K
-        glDrawArrays(GL_TRIANGLE_STRIP, ContainerObject.shader_offset + 8, 6) # K
-        glDrawArrays(GL_TRIANGLE_STRIP, ContainerObject.shader_offset + 14, 4) # N
-        glDrawArrays(GL_TRIANGLE_STRIP, ContainerObject.shader_offset + 18, 4) # N
-        glDrawArrays(GL_TRIANGLE_STRIP, ContainerObject.shader_offset + 22, 4) # N
-        glDrawArrays(GL_TRIANGLE_STRIP, ContainerObject.shader_offset + 26, 4) # G
-        glDrawArrays(GL_TRIANGLE_STRIP, ContainerObject.shader_offset + 30, 4) # G
-        glDrawArrays(GL_TRIANGLE_STRIP, ContainerObject.shader_offset + 34, 4) # G
-        glDrawArrays(GL_TRIANGLE_STRIP, ContainerObject.shader_offset + 38, 4) # G
-        glDrawArrays(GL_TRIANGLE_STRIP, ContainerObject.shader_offset + 42, 4) # G
+        ContainerObject.shader_program.set4Float('u_color',[1.0, 1.0, 1.0, 1.0])
+        glDrawArrays(GL_TRIANGLES, ContainerObject.shader_offset, ContainerObject.shader_count)
 
 
     def logic(self, keys={}, buttons={}, objects=[]) -> None:
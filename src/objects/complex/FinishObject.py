@@ -23,6 +23,7 @@ class FinishObject(GameObject):
         ( 1.0,  -1.0,  0.0),
     ]
     subscribe_keys = []
+    static = True
     
 
     def get_vertices():
@@ -48,7 +49,7 @@ class FinishObject(GameObject):
     def draw(self):
         """Desenha o objeto na tela"""
         # Prepare the model transformation matrix
-        model_matrix = np.array(self._generate_model_matrix(), np.float32)
+        model_matrix = self._get_model_matrix()
 
         # Send final matrix to the GPU unit
         FinishObject.shader_program.set4fMatrix('u_model_matrix', model_matrix)
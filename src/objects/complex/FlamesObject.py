@@ -7,7 +7,9 @@ import math
 import random
 
 from src.shaders.Shader import Shader
-from src.shaders.MagmaShader import vertex_code, fragment_code
+from src.shaders.RenderTarget import RenderTarget
+from src.shaders.MagmaShader import vertex_code, fragment_code, texture_fragment_code, sample_vertex_code, sample_fragment_code
+from src.helpers.noise import generate_noise_texture
 from src.objects.GameObject import GameObject
 from src.colliders.Hitbox import Hitbox
 from src.helpers.vertex import generate_random_circle_vertexes
@@ -15,13 +17,41 @@ from src.helpers.vertex import generate_random_circle_vertexes
 class FlamesObject(GameObject):
     """
     Implementa a poça de fogo incendiária que mata o robozinho.
+
+    O campo de lava (MagmaShader) é calculado uma única vez por frame, para todas as poças,
+    em uma textura compartilhada com `lava_scale` vezes a resolução da tela (ver 
+    prepare_draw). Cada poça apenas amostra essa textura na sua posição da tela. A animação
+    usa o tempo da simulação compartilhado por todos os shaders (ver FrameGlobals).
+
+    A qualidade do campo de lava (número de oitavas e resolução) é definida pelos presets
+    de `lava_quality_presets` (ver set_lava_quality).
+
+    Com `lava_noise_texture` o ruído do campo de lava é lido de uma textura pré-calculada
+    (ver helpers.noise) ao invés de calculado com hashes (deve ser definido antes do
+    primeiro frame). É uma alternativa mais leve e opcional, pois o padrão da lava não é
+    idêntico ao calculado com hashes.
     """
 
-    shader_program  = Shader(vertex_code, fragment_code)
+    shader_program  = Shader(sample_vertex_code, sample_fragment_code)
     shader_offset   = 0
     shader_vertices = []
     subscribe_keys  = []
     num_vertices    = 128
+    base_num_vertices = 128
+
+    lava_program = None
+    lava_target  = None
+    lava_scale   = 1.0
+    lava_octaves = 6
+    lava_quality_presets = {
+        "low":    { "octaves": 3, "scale": 0.5 },
+        "medium": { "octaves": 6, "scale": 0.5 },
+        "high":   { "octaves": 6, "scale": 1.0 },
+    }
+    lava_texture_unit  = 2
+    lava_noise_texture = False
+    noise_size = 256
+    noise_texture_unit = 3
 
     def get_vertices():
         pi = 3.14
@@ -31,6 +61,7 @@ class FlamesObject(GameObject):
         # vertices = np.zeros(FlamesObject.num_vertices, [("position", np.float32, 2)])
 
         angle = 0.0
+        FlamesObject.shader_vertices = []
         for counter in range(FlamesObject.num_vertices):
             angle += 2*pi/FlamesObject.num_vertices 
             x = math.cos(angle)*radius
@@ -43,13 +74,96 @@ class FlamesObject(GameObject):
             y = math.sin(angle)*radius
             FlamesObject.shader_vertices += [(x,y,0.0)]
 
-        return FlamesObject.shader_vertices
-
-
-    def __init__(self, position=(0,0), size=(200,200), rotate=0, window_resolution=(600,600)) -> None:
-        super().__init__(position=position, size=size, rotate=rotate, window_resolution=window_resolution)
-
-        self.__u_time = 0.0
+        # Bounding square (with margin) used to draw the lava texture
+        quad = [(-1.1, 1.1, 0.0), (-1.1, -1.1, 0.0), (1.1, 1.1, 0.0), (1.1, -1.1, 0.0)]
+        return FlamesObject.shader_vertices + quad
+
+
+    def set_lava_quality(quality="high"):
+        """
+        Aplica um dos presets de qualidade do campo de lava (low, medium ou high), trocando
+        detalhes (oitavas do ruído) e resolução por velocidade.
+        """
+        if quality not in FlamesObject.lava_quality_presets:
+            raise ValueError("Qualidade de lava desconhecida: {}".format(quality))
+
+        FlamesObject.lava_octaves = FlamesObject.lava_quality_presets[quality]["octaves"]
+        FlamesObject.lava_scale   = FlamesObject.lava_quality_presets[quality]["scale"]
+
+
+    def set_quality(settings={}) -> bool:
+        """Aplica a qualidade da lava e a tesselação da poça (ver QualityGovernor)"""
+        FlamesObject.set_lava_quality(settings.get("lava", "high"))
+
+        num_vertices = max(16, int(FlamesObject.base_num_vertices * settings.get("tessellation", 1.0)))
+        changed = num_vertices != FlamesObject.num_vertices
+        FlamesObject.num_vertices = num_vertices
+        return changed
+
+
+    def prepare_draw(items=[]):
+        """
+        Desenha o campo de lava na textura compartilhada, apenas na região das poças, 
+        antes delas serem desenhadas.
+        """
+        if len(items) == 0:
+            return
+
+        # Create the shared target when the first frame is drawn (or the scale changed)
+        width  = max(1, int(items[0].window_resolution[0] * FlamesObject.lava_scale))
+        height = max(1, int(items[0].window_resolution[1] * FlamesObject.lava_scale))
+        if FlamesObject.lava_program == None:
+            FlamesObject.configure_lava_program()
+        if FlamesObject.lava_target == None or (FlamesObject.lava_target.width, FlamesObject.lava_target.height) != (width, height):
+            if FlamesObject.lava_target != None:
+                FlamesObject.lava_target.delete()
+            FlamesObject.lava_target = RenderTarget(width, height, FlamesObject.lava_texture_unit, GL_LINEAR)
+
+        # Clear the target with transparency, keeping the clear color of the screen
+        FlamesObject.lava_target.bind()
+        clear_color = glGetFloatv(GL_COLOR_CLEAR_VALUE)
+        glClearColor(0.0, 0.0, 0.0, 0.0)
+        glClear(GL_COLOR_BUFFER_BIT)
+        glClearColor(*clear_color)
+
+        FlamesObject.lava_program.use()
+        FlamesObject.lava_program.setFloat('u_resolution_scale', FlamesObject.lava_scale)
+        FlamesObject.lava_program.setFloat('u_octaves', float(FlamesObject.lava_octaves))
+        FlamesObject.lava_program.setInt('u_noise', FlamesObject.noise_texture_unit)
+        FlamesObject.lava_program.setFloat('u_noise_size', float(FlamesObject.noise_size))
+        for item in items:
+            FlamesObject.lava_program.set4fMatrix('u_model_matrix', item._get_model_matrix())
+            glDrawArrays(GL_TRIANGLE_STRIP, FlamesObject.shader_offset + FlamesObject.num_vertices, 4)
+
+        FlamesObject.lava_target.unbind()
+
+        glActiveTexture(GL_TEXTURE0 + FlamesObject.lava_texture_unit)
+        glBindTexture(GL_TEXTURE_2D, FlamesObject.lava_target.texture)
+        glActiveTexture(GL_TEXTURE0)
+
+
+    def configure_lava_program():
+        """
+        Compila o programa do campo de lava na variante escolhida e, se o ruído vier de 
+        uma textura, envia os valores da grade para a GPU (filtro linear e repetição).
+        """
+        if not FlamesObject.lava_noise_texture:
+            FlamesObject.lava_program = Shader(vertex_code, fragment_code)
+            FlamesObject.lava_program.compile()
+            return
+
+        FlamesObject.lava_program = Shader(vertex_code, texture_fragment_code)
+        FlamesObject.lava_program.compile()
+
+        values = generate_noise_texture(FlamesObject.noise_size)
+        glActiveTexture(GL_TEXTURE0 + FlamesObject.noise_texture_unit)
+        glBindTexture(GL_TEXTURE_2D, glGenTextures(1))
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_R32F, FlamesObject.noise_size, FlamesObject.noise_size, 0, GL_RED, GL_FLOAT, values)
+        glActiveTexture(GL_TEXTURE0)
 
 
     def configure_hitbox(self) -> None:
@@ -66,16 +180,13 @@ class FlamesObject(GameObject):
     def draw(self):
         """Desenha o objeto na tela"""
         # Prepare the model transformation matrix
-        model_matrix = np.array(self._generate_model_matrix(), np.float32)
+        model_matrix = self._get_model_matrix()
 
         # Send final matrix to the GPU unit
         FlamesObject.shader_program.set4fMatrix('u_model_matrix', model_matrix)
-        FlamesObject.shader_program.setFloat('u_time', self.__u_time)
-        FlamesObject.shader_program.set2Float('u_resolution', [1200.0, 600.0])
-        self.__u_time += 0.0005
+        FlamesObject.shader_program.setInt('u_lava', FlamesObject.lava_texture_unit)
         
-        # Draw object steps
-        FlamesObject.shader_program.set4Float('u_color',[1.0,0.0,0.3,1.0])
+        # Draw object steps (sampling the shared lava texture)
         glDrawArrays(GL_TRIANGLE_FAN, FlamesObject.shader_offset, FlamesObject.num_vertices)
 
 
@@ -7,6 +7,7 @@ import glfw
 from src.shaders.Shader import Shader
 from src.shaders.BaseShader import vertex_code, fragment_code
 from src.objects.GameObject import GameObject
+from src.helpers.vertex import bake_colored_triangles
 from src.colliders.Hitbox import Hitbox
 from src.helpers.collisions import hitbox_window_collider
 
@@ -64,12 +65,26 @@ class GateObject(GameObject):
         ( 0.4 ,-0.84 , 0.0),
     ]
 
+    shader_parts = [
+        (GL_TRIANGLE_STRIP, 0,  4, [0.69, 0.572, 0.423, 1.0]),  # portao
+        (GL_TRIANGLE_STRIP, 4,  4, [0.0, 0.0, 0.0, 1.0]),       # risco
+        (GL_TRIANGLE_STRIP, 8,  4, [0.0, 0.0, 0.0, 1.0]),       # risco
+        (GL_TRIANGLE_STRIP, 12, 4, [0.0, 0.0, 0.0, 1.0]),       # risco
+        (GL_TRIANGLE_STRIP, 16, 4, [0.0, 0.0, 0.0, 1.0]),       # risco
+        (GL_TRIANGLE_STRIP, 20, 4, [0.737, 0.925, 0.863, 1.0]), # detalhe azul
+        (GL_TRIANGLE_STRIP, 24, 4, [0.737, 0.925, 0.863, 1.0]), # detalhe azul
+        (GL_TRIANGLE_STRIP, 28, 4, [0.737, 0.925, 0.863, 1.0]), # detalhe azul
+        (GL_TRIANGLE_STRIP, 32, 4, [0.737, 0.925, 0.863, 1.0]), # detalhe azul
+    ]
+    shader_count   = 0
     subscribe_keys = []
     
 
     def get_vertices():
-        """Geração dos vértices do Portão"""
-        return GateObject.shader_vertices
+        """Geração dos vértices do Portão (partes convertidas em triângulos coloridos)"""
+        vertices = bake_colored_triangles(GateObject.shader_vertices, GateObject.shader_parts)
+        GateObject.shader_count = len(vertices)
+        return vertices
 
 
     def __init__(self, position=(0,0), size=(200,200), rotate=0, window_resolution=(600,600)) -> None:
@@ -97,26 +112,14 @@ class GateObject(GameObject):
     def draw(self):
         """Desenha o objeto na tela"""
         # Prepare the model transformation matrix
-        model_matrix = np.array(self._generate_model_matrix(), np.float32)
+        model_matrix = self._get_model_matrix()
 
         # Send final matrix to the GPU unit
         GateObject.shader_program.set4fMatrix('u_model_matrix', model_matrix)
         
-        # Draw object steps
-        GateObject.shader_program.set4Float('u_color',[0.69, 0.572, 0.423, 1.0])
-        glDrawArrays(GL_TRIANGLE_STRIP, GateObject.shader_offset+0, 4) # portao
-
-        GateObject.shader_program.set4Float('u_color',[0.0, 0.0, 0.0, 1.0])
-        glDrawArrays(GL_TRIANGLE_STRIP, GateObject.shader_offset+4, 4) # risco
-        glDrawArrays(GL_TRIANGLE_STRIP, GateObject.shader_offset+8, 4) # risco
-        glDrawArrays(GL_TRIANGLE_STRIP, GateObject.shader_offset+12, 4) # risco
-        glDrawArrays(GL_TRIANGLE_STRIP, GateObject.shader_offset+16, 4) # risco
-
-        GateObject.shader_program.set4Float('u_color',[0.737, 0.925, 0.863, 1.0])
-        glDrawArrays(GL_TRIANGLE_STRIP, GateObject.shader_offset+20, 4) # detalhe azul
-        glDrawArrays(GL_TRIANGLE_STRIP, GateObject.shader_offset+24, 4) # detalhe azul
-        glDrawArrays(GL_TRIANGLE_STRIP, GateObject.shader_offset+28, 4) # detalhe azul
-        glDrawArrays(GL_TRIANGLE_STRIP, GateObject.shader_offset+32, 4) # detalhe azul
+        # Draw all parts at once (colors are in the vertices)
+        GateObject.shader_program.set4Float('u_color',[1.0, 1.0, 1.0, 1.0])
+        glDrawArrays(GL_TRIANGLES, GateObject.shader_offset, GateObject.shader_count)
 
 
     def logic(self, keys={}, buttons={}, objects=[]) -> None:
@@ -148,11 +151,7 @@ class GateObject(GameObject):
 
         # Verificando se o movimento é válido
         # collision |= hitbox_window_collider(self.position, self.size, self.window_resolution)
-        for item in objects: 
-            if collision:
-                break
-            if item != self:
-                collision |= self.object_hitbox.check_collision(item.object_hitbox)
+        collision |= objects.collides(self.object_hitbox, exclude=self)
         
         # Se colidiu cancela o movimento e retorna estado anterior
         if collision:
@@ -7,6 +7,7 @@ import glfw
 from src.shaders.Shader import Shader
 from src.shaders.BaseShader import vertex_code, fragment_code
 from src.objects.GameObject import GameObject
+from src.helpers.vertex import bake_colored_triangles
 from src.colliders.Hitbox import Hitbox
 from src.helpers.collisions import hitbox_window_collider
 
@@ -53,12 +54,24 @@ class ParedeSageObject(GameObject):
         (+0.55, +1.0, 0.0),
         (+0.55, -1.0, 0.0)
     ]
+    shader_parts = [
+        (GL_TRIANGLE_STRIP, 0,  4, [0.414, 0.759, 0.582, 1.0]), # esquerda
+        (GL_TRIANGLE_STRIP, 4,  4, [0.414, 0.759, 0.582, 1.0]), # esquerda centro
+        (GL_TRIANGLE_STRIP, 8,  4, [0.414, 0.759, 0.582, 1.0]), # direita centro
+        (GL_TRIANGLE_STRIP, 12, 4, [0.414, 0.759, 0.582, 1.0]), # direita
+        (GL_TRIANGLE_STRIP, 16, 4, [0.314, 0.659, 0.482, 1.0]), # divisor esquerda
+        (GL_TRIANGLE_STRIP, 20, 4, [0.314, 0.659, 0.482, 1.0]), # divisor central
+        (GL_TRIANGLE_STRIP, 24, 4, [0.314, 0.659, 0.482, 1.0]), # divisor direita
+    ]
+    shader_count   = 0
     subscribe_keys = []
     
 
     def get_vertices():
-        """Geração dos vértices do Robo"""
-        return ParedeSageObject.shader_vertices
+        """Geração dos vértices do Robo (partes convertidas em triângulos coloridos)"""
+        vertices = bake_colored_triangles(ParedeSageObject.shader_vertices, ParedeSageObject.shader_parts)
+        ParedeSageObject.shader_count = len(vertices)
+        return vertices
 
 
     def __init__(self, position=(0,0), size=(200,200), rotate=0, window_resolution=(600,600)) -> None:
@@ -84,21 +97,14 @@ class ParedeSageObject(GameObject):
     def draw(self):
         """Desenha o objeto na tela"""
         # Prepare the model transformation matrix
-        model_matrix = np.array(self._generate_model_matrix(), np.float32)
+        model_matrix = self._get_model_matrix()
 
         # Send final matrix to the GPU unit
         ParedeSageObject.shader_program.set4fMatrix('u_model_matrix', model_matrix)
         
-        ParedeSageObject.shader_program.set4Float('u_color',[0.414, 0.759, 0.582, 1.0])
-        glDrawArrays(GL_TRIANGLE_STRIP, ParedeSageObject.shader_offset + 0, 4) # esquerda
-        glDrawArrays(GL_TRIANGLE_STRIP, ParedeSageObject.shader_offset + 4, 4) # esquerda centro
-        glDrawArrays(GL_TRIANGLE_STRIP, ParedeSageObject.shader_offset + 8, 4) # direita centro
-        glDrawArrays(GL_TRIANGLE_STRIP, ParedeSageObject.shader_offset + 12, 4) # direita
-
-        ParedeSageObject.shader_program.set4Float('u_color',[0.314, 0.659, 0.482, 1.0])
-        glDrawArrays(GL_TRIANGLE_STRIP, ParedeSageObject.shader_offset + 16, 4) # divisor esquerda
-        glDrawArrays(GL_TRIANGLE_STRIP, ParedeSageObject.shader_offset + 20, 4) # divisor central
-        glDrawArrays(GL_TRIANGLE_STRIP, ParedeSageObject.shader_offset + 24, 4) # divisor direita
+        # Draw all parts at once (colors are in the vertices)
+        ParedeSageObject.shader_program.set4Float('u_color',[1.0, 1.0, 1.0, 1.0])
+        glDrawArrays(GL_TRIANGLES, ParedeSageObject.shader_offset, ParedeSageObject.shader_count)
 
 
     def logic(self, keys={}, buttons={}, objects=[]) -> None:
@@ -118,11 +124,8 @@ class ParedeSageObject(GameObject):
 
         # Verificando se o movimento é válido
         collision |= hitbox_window_collider(self.position, self.size, self.window_resolution)
-        for item in objects: 
-            if collision:
-                break
-            if item != self:
-                collision |= self.object_hitbox.check_collision(item.object_hitbox)
+        if not collision:
+            collision |= objects.collides(self.object_hitbox, exclude=self)
         
         # Se colidiu cancela o movimento e retorna estado anterior
         if collision:
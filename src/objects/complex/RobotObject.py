@@ -9,6 +9,7 @@ from src.shaders.Shader import Shader
 from src.shaders.BaseShader import vertex_code, fragment_code
 from src.objects.GameObject import GameObject
 from src.helpers.collisions import hitbox_window_collider
+from src.helpers.vertex import bake_colored_triangles
 from src.colliders.Hitbox import Hitbox
 
 # Types used in Game Collision Logic
@@ -32,9 +33,12 @@ class RobotObject(GameObject):
     shader_program  = Shader(vertex_code, fragment_code)
     shader_offset   = 0
     shader_vertices = []
+    shader_count    = 0
     subscribe_keys  = []
+    chunk_anchor    = True
 
     num_vertices = 10
+    base_num_vertices = 10
     
     def get_vertices():
         """Geração dos vértices do Robo"""
@@ -140,7 +144,34 @@ class RobotObject(GameObject):
             y = math.sin(angle)*radius + posy
             RobotObject.shader_vertices += [(x,y,0.0)]
 
-        return RobotObject.shader_vertices
+        # Convert the parts into colored triangles (drawn in a single call)
+        n = RobotObject.num_vertices
+        parts = [
+            (GL_TRIANGLE_FAN,   0,  7, [0.678, 0.333, 0.118, 1.0]), # perfil
+            (GL_TRIANGLE_FAN,   7,  6, [0.153, 0.188, 0.188, 1.0]), # cima
+            (GL_TRIANGLE_FAN,   13, 5, [0.290, 0.498, 0.447, 1.0]), # azul direita
+            (GL_TRIANGLE_FAN,   18, 5, [0.290, 0.498, 0.447, 1.0]), # azul esquerda
+            (GL_TRIANGLE_FAN,   23, 6, [0.972, 0.898, 0.294, 1.0]), # contorno smile preto
+            (GL_TRIANGLE_FAN,   29,     n, [0.647, 0.247, 0.117, 1.0]), # carinha
+            (GL_TRIANGLE_FAN,   29 + n, n, [0.647, 0.247, 0.117, 1.0]),
+            (GL_TRIANGLE_STRIP, 29 + 2*n, 4, [0.647, 0.247, 0.117, 1.0]),
+            (GL_TRIANGLE_STRIP, 33 + 2*n, 4, [0.647, 0.247, 0.117, 1.0]),
+            (GL_TRIANGLE_STRIP, 37 + 2*n, 4, [0.647, 0.247, 0.117, 1.0]),
+            (GL_TRIANGLE_STRIP, 41 + 2*n, 4, [0.647, 0.247, 0.117, 1.0]),
+            (GL_TRIANGLE_FAN,   45 + 2*n, n, [0.212, 0.231, 0.227, 1.0]),
+            (GL_TRIANGLE_FAN,   45 + 3*n, n, [0.212, 0.231, 0.227, 1.0]),
+        ]
+        vertices = bake_colored_triangles(RobotObject.shader_vertices, parts)
+        RobotObject.shader_count = len(vertices)
+        return vertices
+
+
+    def set_quality(settings={}) -> bool:
+        """Aplica a tesselação dos círculos do robô (ver QualityGovernor)"""
+        num_vertices = max(4, int(RobotObject.base_num_vertices * settings.get("tessellation", 1.0)))
+        changed = num_vertices != RobotObject.num_vertices
+        RobotObject.num_vertices = num_vertices
+        return changed
 
 
     def __init__(self, position=(0,0), size=(200,200), rotate=0, window_resolution=(600,600)) -> None:
@@ -167,36 +198,14 @@ class RobotObject(GameObject):
         Desenha o triângulo na tela
         """
         # Prepare the model transformation matrix
-        model_matrix = np.array(self._generate_model_matrix(), np.float32)
+        model_matrix = self._get_model_matrix()
 
         # Send final matrix to the GPU unit
         RobotObject.shader_program.set4fMatrix('u_model_matrix', model_matrix)
         
-        # Draw steps
-        RobotObject.shader_program.set4Float('u_color',[0.678, 0.333, 0.118, 1.0])
-        glDrawArrays(GL_TRIANGLE_FAN, RobotObject.shader_offset+0, 7) # perfil
-
-        RobotObject.shader_program.set4Float('u_color',[ 0.153, 0.188, 0.188, 1.0])
-        glDrawArrays(GL_TRIANGLE_FAN, RobotObject.shader_offset+7, 6) # cima
-
-        RobotObject.shader_program.set4Float('u_color',[ 0.290, 0.498, 0.447, 1.0])
-        glDrawArrays(GL_TRIANGLE_FAN, RobotObject.shader_offset+13, 5) # azul direita
-        glDrawArrays(GL_TRIANGLE_FAN, RobotObject.shader_offset+18, 5) # azul esquerda
-
-        RobotObject.shader_program.set4Float('u_color',[ 0.972, 0.898, 0.294, 1.0])
-        glDrawArrays(GL_TRIANGLE_FAN, RobotObject.shader_offset+23, 6) # contorno smile preto
-
-        RobotObject.shader_program.set4Float('u_color',[ 0.647, 0.247, 0.117, 1.0])
-        glDrawArrays(GL_TRIANGLE_FAN, RobotObject.shader_offset+29, RobotObject.num_vertices) #carinha
-        glDrawArrays(GL_TRIANGLE_FAN, RobotObject.shader_offset+29 + RobotObject.num_vertices, RobotObject.num_vertices)
-        glDrawArrays(GL_TRIANGLE_STRIP, RobotObject.shader_offset+29 + 2 * RobotObject.num_vertices, 4)
-        glDrawArrays(GL_TRIANGLE_STRIP, RobotObject.shader_offset+33 + 2 * RobotObject.num_vertices, 4)
-        glDrawArrays(GL_TRIANGLE_STRIP, RobotObject.shader_offset+37 + 2 * RobotObject.num_vertices, 4)
-        glDrawArrays(GL_TRIANGLE_STRIP, RobotObject.shader_offset+41 + 2 * RobotObject.num_vertices, 4)
-
-        RobotObject.shader_program.set4Float('u_color',[ 0.212, 0.231, 0.227, 1.0])
-        glDrawArrays(GL_TRIANGLE_FAN, RobotObject.shader_offset+45 + 2 * RobotObject.num_vertices, RobotObject.num_vertices)
-        glDrawArrays(GL_TRIANGLE_FAN, RobotObject.shader_offset+45 + 3 * RobotObject.num_vertices, RobotObject.num_vertices)
+        # Draw all parts at once (colors are in the vertices)
+        RobotObject.shader_program.set4Float('u_color',[1.0, 1.0, 1.0, 1.0])
+        glDrawArrays(GL_TRIANGLES, RobotObject.shader_offset, RobotObject.shader_count)
 
 
     def __collision_logic(self, move,  objects=[]) -> None:
@@ -208,28 +217,25 @@ class RobotObject(GameObject):
         self.configure_hitbox()
 
         collision |= hitbox_window_collider(self.position, self.size, self.window_resolution)        
-        for item in objects: 
-            if item != self and type(item) in [BoxObject, ContainerObject, ParedeSageObject, GateObject]:
-                collision |= self.object_hitbox.check_collision(item.object_hitbox)
-            if collision:
-                self.position[move] = last_position
-                self.__delta_direction[move] *= -1.0
-                break
+        if not collision:
+            collision |= objects.collides(self.object_hitbox, exclude=self, types=[BoxObject, ContainerObject, ParedeSageObject, GateObject])
+
+        if collision:
+            self.position[move] = last_position
+            self.__delta_direction[move] *= -1.0
 
 
     def __event_trigger_logic(self, objects=[]) -> None:
         """Wrapper event triggers logic"""
-        for item in objects:
-            if item == self:
-                continue
-            if type(item) == RotatorObject and self.object_hitbox.check_collision(item.object_hitbox):
+        for item in objects.collisions(self.object_hitbox, exclude=self):
+            if type(item) == RotatorObject:
                 rad = item.rotate*(np.pi/180.0)
                 self.__delta_direction[0] = np.cos(rad)
                 self.__delta_direction[1] = np.sin(rad)
-            elif type(item) == FlamesObject and self.object_hitbox.check_collision(item.object_hitbox):
+            elif type(item) == FlamesObject:
                 self.__dead = True
                 break
-            elif type(item) == FinishObject and self.object_hitbox.check_collision(item.object_hitbox):
+            elif type(item) == FinishObject:
                 self.__delta_translate = 0.0
                 break
 
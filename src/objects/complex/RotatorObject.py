@@ -24,18 +24,17 @@ class RotatorObject(GameObject):
         ( 1.0,  -1.0,  0.0),
     ]
     shader_textures = ["assets/object_arrows_crop.jpg"]
-    shader_textures_ids = []
+    shader_textures_layers = []
     subscribe_keys = []
     
 
     def get_vertices():
         """Geração dos vértices do Robo"""
-        RotatorObject.shader_vertices += generate_circle_vertexes(32, radius=0.7)
-        RotatorObject.shader_vertices += [
+        # Square followed by the internal circle and the direction line
+        return RotatorObject.shader_vertices + generate_circle_vertexes(32, radius=0.7) + [
             ( 0.0,   0.0,  0.0),
             ( 0.7,   0.0,  0.0),
         ]
-        return RotatorObject.shader_vertices
 
 
     def __init__(self, position=(0,0), size=(200,200), rotate=0, window_resolution=(600,600)) -> None:
@@ -58,12 +57,15 @@ class RotatorObject(GameObject):
         """Desenha o objeto na tela, porém aplica rotação apenas no círculo"""
 
          # Prepare the model transformation with rotation
-        model_matrix = np.array(self._generate_model_matrix(), np.float32)
+        model_matrix = self._get_model_matrix()
+        gl_rotate = self._gl_rotate
         self._gl_rotate = 0.0
         model_matrix_no_rot = np.array(self._generate_model_matrix(), np.float32)
+        self._gl_rotate = gl_rotate
         
-        # Set Texture id
-        glBindTexture(GL_TEXTURE_2D, RotatorObject.shader_textures_ids[0])
+        # Set Texture layer (without repetition, the program is shared with the background)
+        RotatorObject.shader_program.setFloat('u_layer', RotatorObject.shader_textures_layers[0])
+        RotatorObject.shader_program.set2Float('u_pattern_repeat', (1.0, 1.0))
 
         # Draw object steps
         RotatorObject.shader_program.set4fMatrix('u_model_matrix', model_matrix_no_rot)
@@ -55,7 +55,7 @@ class BoucingBallObject(GameObject):
         Desenha o triângulo na tela
         """
         # Prepare the model transformation matrix
-        model_matrix = np.array(self._generate_model_matrix(), np.float32)
+        model_matrix = self._get_model_matrix()
 
         # Send final matrix to the GPU unit
         BoucingBallObject.shader_program.set4fMatrix('u_model_matrix', model_matrix)
@@ -77,11 +77,8 @@ class BoucingBallObject(GameObject):
         self.configure_hitbox()
 
         collision |= hitbox_window_collider(self.position, self.size, self.window_resolution)        
-        for item in objects: 
-            if item != self:
-                collision |= self.object_hitbox.check_collision(item.object_hitbox)
-            if collision:
-                break
+        if not collision:
+            collision |= objects.collides(self.object_hitbox, exclude=self)
 
         if collision:
             self.position[0] = last_position
@@ -95,11 +92,8 @@ class BoucingBallObject(GameObject):
         self.configure_hitbox()
 
         collision |= hitbox_window_collider(self.position, self.size, self.window_resolution)        
-        for item in objects: 
-            if item != self:
-                collision |= self.object_hitbox.check_collision(item.object_hitbox)
-            if collision:
-                break
+        if not collision:
+            collision |= objects.collides(self.object_hitbox, exclude=self)
 
         if collision:
             self.position[1] = last_position
@@ -47,7 +47,7 @@ class RunningSquareObject(GameObject):
         Desenha o triângulo na tela
         """
         # Prepare the model transformation matrix
-        model_matrix = np.array(self._generate_model_matrix(), np.float32)
+        model_matrix = self._get_model_matrix()
 
         # Send final matrix to the GPU unit
         RunningSquareObject.shader_program.set4fMatrix('u_model_matrix', model_matrix)
@@ -69,11 +69,7 @@ class RunningSquareObject(GameObject):
         self.position[0] += keys.get(glfw.KEY_D, {"action": 0})["action"] * self.__delta_translate
         self.configure_hitbox()
        
-        for item in objects: 
-            if item != self:
-                collision |= self.object_hitbox.check_collision(item.object_hitbox)
-            if collision:
-                break
+        collision |= objects.collides(self.object_hitbox, exclude=self)
         
         if collision:
             self.position[0] = last_position
@@ -86,11 +82,7 @@ class RunningSquareObject(GameObject):
         self.position[1] += keys.get(glfw.KEY_W, {"action": 0})["action"] * self.__delta_translate
         self.configure_hitbox()
 
-        for item in objects: 
-            if item != self:
-                collision |= self.object_hitbox.check_collision(item.object_hitbox)
-            if collision:
-                break
+        collision |= objects.collides(self.object_hitbox, exclude=self)
 
         if collision:
             self.position[1] = last_position
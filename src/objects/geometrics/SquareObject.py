@@ -29,7 +29,7 @@ class SquareObject(GameObject):
         Desenha o triângulo na tela
         """
         # Prepare the model transformation matrix
-        model_matrix = np.array(self._generate_model_matrix(), np.float32)
+        model_matrix = self._get_model_matrix()
 
         # Send final matrix to the GPU unit
         SquareObject.shader_program.set4fMatrix('u_model_matrix', model_matrix)
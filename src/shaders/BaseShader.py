@@ -1,21 +1,28 @@
 #!/usr/bin/env python3
 
+# Obs: a cor final é o u_color multiplicado pela cor do vértice (branca nos objetos 
+#      que não definem cores por vértice).
+
 vertex_code = """
     attribute vec3 position;
+    attribute vec4 color;
     varying   vec3 fPosition;
+    varying   vec4 fColor;
     uniform   mat4 u_model_matrix;
 
     void main(){ 
         gl_Position = u_model_matrix * vec4(position, 1.0);
         fPosition   = gl_Position.xyz;
+        fColor      = color;
     }
 """
 
 fragment_code = """
     varying vec3 fPosition;
+    varying vec4 fColor;
     uniform vec4 u_color;
 
     void main(){ 
-        gl_FragColor  = u_color;
+        gl_FragColor  = u_color * fColor;
     }
-"""
\ No newline at end of file
+"""
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+import numpy as np
+from OpenGL.GL import *
+
+
+# Obs: declaração do bloco que deve ser incluída nos shaders que usam os valores globais
+#      do frame. O #extension deve vir antes de qualquer código do shader.
+block_code = """
+#extension GL_ARB_uniform_buffer_object : enable
+
+layout(std140) uniform FrameGlobals {
+    vec2  u_resolution;
+    float u_time;
+    float u_frame;
+};
+"""
+
+
+class FrameGlobals:
+    """
+    Uniform Buffer Object (UBO) com os valores globais do frame: resolução da tela, tempo
+    da simulação (em segundos) e número do frame. É preenchido uma única vez por frame
+    pelo GameController e compartilhado por todos os programas que declaram o bloco
+    `FrameGlobals` (ver block_code), que é ligado ao ponto `binding` na compilação (ver
+    Shader.compile).
+    """
+
+    block_name = "FrameGlobals"
+    binding    = 0
+
+
+    def __init__(self) -> None:
+        """Cria o buffer e o liga ao ponto do bloco (necessita do contexto da tela)"""
+        # Layout std140: vec2 (offset 0), float (offset 8), float (offset 12)
+        self.values = np.zeros(4, dtype=np.float32)
+        self.__buffer = glGenBuffers(1)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.__buffer)
+        glBufferData(GL_UNIFORM_BUFFER, self.values.nbytes, self.values, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
+        glBindBufferBase(GL_UNIFORM_BUFFER, FrameGlobals.binding, self.__buffer)
+
+
+    def update(self, resolution, time, frame) -> None:
+        """Envia os valores do frame atual para a GPU"""
+        self.values[:] = (resolution[0], resolution[1], time, frame)
+        glBindBuffer(GL_UNIFORM_BUFFER, self.__buffer)
+        glBufferSubData(GL_UNIFORM_BUFFER, 0, self.values.nbytes, self.values)
+        glBindBuffer(GL_UNIFORM_BUFFER, 0)
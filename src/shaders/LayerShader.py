@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+
+# Obs: desenha um quadrado na tela inteira (vértices já em coordenadas normalizadas)
+#      com a textura de uma camada desenhada previamente (ver RenderTarget).
+
+vertex_code = """
+    attribute vec3 position;
+    varying   vec2 fTexCoord;
+
+    void main(){ 
+        gl_Position = vec4(position, 1.0);
+        fTexCoord   = (position.xy + 1.0) / 2.0;
+    }
+"""
+
+fragment_code = """
+    varying vec2 fTexCoord;
+    uniform sampler2D u_layer;
+
+    void main(){ 
+        gl_FragColor = vec4(texture2D(u_layer, fTexCoord).rgb, 1.0);
+    }
+"""
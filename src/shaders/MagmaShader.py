@@ -1,10 +1,15 @@
 #!/usr/bin/env python3
+from src.shaders.FrameGlobals import block_code
+
+# Obs: o campo de lava depende apenas da posição do pixel na tela (gl_FragCoord), então
+#      ele pode ser calculado uma única vez por frame em uma textura (possivelmente com 
+#      resolução reduzida, ver u_resolution_scale) que é amostrada por todos os objetos
+#      pelos shaders sample_vertex_code e sample_fragment_code.
 
 vertex_code = """
     attribute vec3 position;
     varying   vec3 fPosition;
     uniform   mat4 u_model_matrix;
-    uniform   mat4 u_time;
 
     void main(){ 
         gl_Position = u_model_matrix * vec4(position, 1.0);
@@ -13,7 +18,7 @@ vertex_code = """
     }
 """
 
-fragment_code = """
+header_code = block_code + """
 // Noise animation - Lava (Adaptado por Gabriel Van Loon)
 // by nimitz (twitter: @stormoid)
 // https://www.shadertoy.com/view/lslXRS
@@ -24,8 +29,8 @@ fragment_code = """
 precision mediump float;
 #endif
 
-uniform vec2 u_resolution;
-uniform float u_time;
+uniform float u_resolution_scale;
+uniform float u_octaves;
 
 #define time iTime*0.1
 
@@ -39,6 +44,9 @@ uniform float u_time;
         return mat2(c,-s,s,c);
     }
 
+"""
+
+noise_code = """
     float random (in vec2 st) {
         return fract(sin(dot(st.xy, vec2(12.9898,78.233))) * 43758.5453123);
     }
@@ -65,6 +73,29 @@ uniform float u_time;
                 (d - b) * u.x * u.y;
     }
 
+"""
+
+# Variante do ruído com os valores aleatórios da grade lidos de uma textura (ver 
+# helpers.noise.generate_noise_texture), com um único acesso à textura por amostra: o 
+# filtro linear interpola os 4 cantos com os pesos já suavizados (curva de Hermite).
+texture_noise_code = """
+    uniform sampler2D u_noise;
+    uniform float u_noise_size;
+
+    float noise( in vec2 st ){
+        vec2 i = floor(st);
+        vec2 f = fract(st);
+
+        // Cubic Hermine Curve.  Same as SmoothStep()
+        vec2 u = f*f*(3.0-2.0*f);
+
+        // Linear filter mixes the 4 corners with the smoothed percentages
+        return texture2D(u_noise, (i + u + 0.5) / u_noise_size).r;
+    }
+
+"""
+
+flow_code = """
     vec2 gradn(vec2 p){
         float ep = .09;
         float gradx = noise(vec2(p.x+ep,p.y))-noise(vec2(p.x-ep,p.y));
@@ -76,19 +107,25 @@ uniform float u_time;
         float z=2.;
         float rz = 0.;
         vec2 bp = p;
+
+        //animation time (simulation seconds, 0.0005 by frame at 60 fps)
+        float t = u_time*0.03;
         for (float i= 1.;i < 7.;i++ )
         {
+            //quality: only the first u_octaves octaves (max. 6)
+            if (i > u_octaves) break;
+
             //primary flow speed
-            p += u_time*.6;
+            p += t*.6;
             
             //secondary flow speed (speed of the perceived flow)
-            bp += u_time*1.9;
+            bp += t*1.9;
             
             //displacement field (try changing time multiplier)
-            vec2 gr = gradn(i*p*.34+u_time*1.);
+            vec2 gr = gradn(i*p*.34+t*1.);
             
             //rotation of the displacement field
-            gr*=makem2(u_time*6.-(0.05*p.x+0.03*p.y)*40.);
+            gr*=makem2(t*6.-(0.05*p.x+0.03*p.y)*40.);
             
             //displace the system
             p += gr*.5;
@@ -111,7 +148,7 @@ uniform float u_time;
 
     void main() {
         // Código Original
-        vec2 p = gl_FragCoord.xy / u_resolution.xy-0.5;
+        vec2 p = (gl_FragCoord.xy / u_resolution_scale) / u_resolution.xy-0.5;
         p.x *= u_resolution.x/u_resolution.y;
 
         p*= 3.;
@@ -123,4 +160,25 @@ uniform float u_time;
         col=pow(col,vec3(1.4));
         gl_FragColor = vec4(col,1.0);
     }
-"""
\ No newline at end of file
+"""
+
+fragment_code         = header_code + noise_code + flow_code
+texture_fragment_code = header_code + texture_noise_code + flow_code
+
+
+sample_vertex_code = """
+    attribute vec3 position;
+    uniform   mat4 u_model_matrix;
+
+    void main(){ 
+        gl_Position = u_model_matrix * vec4(position, 1.0);
+    }
+"""
+
+sample_fragment_code = block_code + """
+    uniform sampler2D u_lava;
+
+    void main(){ 
+        gl_FragColor = vec4(texture2D(u_lava, gl_FragCoord.xy / u_resolution).rgb, 1.0);
+    }
+"""
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+import numpy as np
+from OpenGL.GL import *
+
+from src.shaders.Shader import Shader
+from src.shaders.LayerShader import vertex_code, fragment_code
+
+
+class RenderTarget:
+    """
+    Framebuffer (FBO) com uma textura de cor RGBA, usado para desenhar uma camada da cena
+    fora da tela e reaproveitar o resultado nos próximos frames. A textura fica ligada
+    na unidade `texture_unit`, evitando conflito com as texturas dos objetos (unidade 0).
+
+    Enquanto `valid` for verdadeiro o conteúdo pode ser reutilizado. Quem desenha a
+    camada deve chamar invalidate() sempre que ela precisar ser desenhada novamente.
+    """
+
+    shader_program = None
+    quad_buffer    = None
+
+
+    def __init__(self, width, height, texture_unit=1, filter=GL_NEAREST) -> None:
+        """
+        Cria o framebuffer e sua textura (necessita do contexto da tela). Alvos com 
+        resolução menor que a tela devem usar o filtro GL_LINEAR.
+        """
+        self.width  = width
+        self.height = height
+        self.texture_unit = texture_unit
+        self.valid = False
+        self.__viewport = None
+        self.__previous_framebuffer = 0
+
+        # Color texture, sampled pixel by pixel
+        self.texture = glGenTextures(1)
+        glActiveTexture(GL_TEXTURE0 + self.texture_unit)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, filter)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, filter)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, self.width, self.height, 0, GL_RGBA, GL_UNSIGNED_BYTE, None)
+        glActiveTexture(GL_TEXTURE0)
+
+        self.__framebuffer = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.__framebuffer)
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, self.texture, 0)
+        if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError("Framebuffer incompleto")
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+
+        # Full screen quad program and vertices (x, y, z, r, g, b, a), shared by all targets
+        if RenderTarget.shader_program == None:
+            RenderTarget.shader_program = Shader(vertex_code, fragment_code)
+            RenderTarget.shader_program.compile()
+
+            quad = np.array([
+                (-1.0,  1.0, 0.0, 1.0, 1.0, 1.0, 1.0),
+                (-1.0, -1.0, 0.0, 1.0, 1.0, 1.0, 1.0),
+                ( 1.0,  1.0, 0.0, 1.0, 1.0, 1.0, 1.0),
+                ( 1.0, -1.0, 0.0, 1.0, 1.0, 1.0, 1.0),
+            ], dtype=np.float32)
+            RenderTarget.quad_buffer = glGenBuffers(1)
+            glBindBuffer(GL_ARRAY_BUFFER, RenderTarget.quad_buffer)
+            glBufferData(GL_ARRAY_BUFFER, quad.nbytes, quad, GL_STATIC_DRAW)
+
+
+    def delete(self) -> None:
+        """Libera o framebuffer e a textura da GPU (o alvo não pode mais ser usado)"""
+        glDeleteFramebuffers(1, [self.__framebuffer])
+        glDeleteTextures(1, [self.texture])
+        self.valid = False
+
+
+    def invalidate(self) -> None:
+        """Marca que o conteúdo da camada deve ser desenhado novamente"""
+        self.valid = False
+
+
+    def bind(self) -> None:
+        """Redireciona os próximos desenhos para o framebuffer"""
+        self.__viewport = glGetIntegerv(GL_VIEWPORT)
+        self.__previous_framebuffer = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.__framebuffer)
+        glViewport(0, 0, self.width, self.height)
+
+
+    def unbind(self) -> None:
+        """Volta a desenhar no framebuffer anterior (tela) e marca o conteúdo como válido"""
+        glBindFramebuffer(GL_FRAMEBUFFER, self.__previous_framebuffer)
+        glViewport(*self.__viewport)
+        self.valid = True
+
+
+    def draw(self) -> None:
+        """Desenha a textura da camada na tela inteira (opaca)"""
+        glActiveTexture(GL_TEXTURE0 + self.texture_unit)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glActiveTexture(GL_TEXTURE0)
+
+        RenderTarget.shader_program.use(RenderTarget.quad_buffer)
+        RenderTarget.shader_program.setInt('u_layer', self.texture_unit)
+        glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
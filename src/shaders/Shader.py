@@ -1,15 +1,42 @@
 #!/usr/bin/env python3
+import os
+import hashlib
+import numpy as np
 from OpenGL.GL import *
 import OpenGL.GL.shaders
 
+from src.shaders.FrameGlobals import FrameGlobals
+
 
 class Shader:
     """
     Classe que encapsula todo o processo de leitura, compilação e linkagem dos 
     shaders de vértices e fragmentos, além de possuir as diretivas básicas para 
     manipulação dos uniforms
+
+    Os helpers de uniforms mantém uma cópia dos valores já enviados ao programa e
+    não chamam o glUniform* quando o valor não mudou (ou o uniform não está ativo).
+
+    O buffer de vértices compartilhado por todos os programas deve ser informado em
+    Shader.vertex_buffer (ver GameController) para que use() sempre aponte o atributo
+    de posição para ele. A configuração dos atributos de cada programa com cada buffer
+    é guardada uma única vez em um Vertex Array Object (ver configure_vertex_array).
+
+    Shaders com o mesmo código fonte compartilham um único programa (e a cópia dos
+    valores dos uniforms), registrado em Shader.programs pelo hash do código. Quando o
+    driver permite, o programa linkado também é salvo em Shader.binary_cache_dir e
+    carregado com glProgramBinary nas próximas execuções.
+
+    Programas que declaram o bloco de uniforms FrameGlobals (tempo, resolução e número
+    do frame) o recebem do buffer compartilhado preenchido uma vez por frame.
     """
 
+    vertex_buffer = None
+    programs = {}
+    current_program = None
+    current_vertex_array = None
+    binary_cache_dir = ".cache"
+
 
     def __init__(self, vertex_code = "", fragment_code = "") -> None:
         """
@@ -21,25 +48,73 @@ class Shader:
         self.fragment_code = fragment_code
         self.__program  = None
         self.__uniforms = {}
+        self.__uniforms_values = {}
         self.__attributes = {}
+        self.__shared = None
 
 
     def compile(self) -> None:
         """
-        Build a shader program with the vertex and fragment code received. It also
-        save previously all the uniforms locations used in the shader. 
+        Build a shader program with the vertex and fragment code received, or reuse the
+        program already built from the same code. It also save previously all the
+        uniforms locations used in the shader.
         
-        Obs: The vertex shader must have the `attribute vec3 position;`.
+        Obs: The vertex shader must have the `attribute vec3 position;` and may have 
+        the `attribute vec4 color;`.
         """
-        self.__program  = glCreateProgram()
+        if self.__program != None:
+            return
+
+        key = hashlib.sha1((self.vertex_code + "\0" + self.fragment_code).encode()).hexdigest()
+        if key not in Shader.programs:
+            program = Shader.__load_binary(key)
+            if program == None:
+                program = Shader.__link(self.vertex_code, self.fragment_code)
+                Shader.__save_binary(key, program)
+
+            # Bind the frame globals block (if used) to the shared uniform buffer
+            block_index = glGetUniformBlockIndex(program, FrameGlobals.block_name)
+            if block_index != GL_INVALID_INDEX:
+                glUniformBlockBinding(program, block_index, FrameGlobals.binding)
+
+            # Save the position and color (optional) attribs locations
+            attributes = {}
+            attributes['position'] = glGetAttribLocation(program, "position")
+            attributes['color']    = glGetAttribLocation(program, "color")
+
+            # Save the locations of all active uniforms (arrays by its base name)
+            uniforms = {}
+            for index in range(glGetProgramiv(program, GL_ACTIVE_UNIFORMS)):
+                name = glGetActiveUniform(program, index)[0].decode().split('[')[0]
+                uniforms[name] = glGetUniformLocation(program, name)
+
+            Shader.programs[key] = {
+                "program": program, "uniforms": uniforms, "values": {}, "attributes": attributes,
+                "vertex_arrays": {}
+            }
+
+        # Shaders of the same program share the shadow copy of the uniforms values
+        shared = Shader.programs[key]
+        self.__shared  = shared
+        self.__program = shared["program"]
+        self.__uniforms = shared["uniforms"]
+        self.__uniforms_values = shared["values"]
+        self.__attributes = shared["attributes"]
+        self.vertex_code   = None
+        self.fragment_code = None
+
+
+    def __link(vertex_code, fragment_code) -> int:
+        """Compile both shaders and link them in a new program"""
+        program = glCreateProgram()
 
         # Create the vertex and shader program
         vertex   = glCreateShader(GL_VERTEX_SHADER)
         fragment = glCreateShader(GL_FRAGMENT_SHADER)
 
         # Set shaders sources code
-        glShaderSource(vertex, self.vertex_code)
-        glShaderSource(fragment, self.fragment_code)
+        glShaderSource(vertex, vertex_code)
+        glShaderSource(fragment, fragment_code)
 
         # Compiling vertex shader
         glCompileShader(vertex)
@@ -56,62 +131,171 @@ class Shader:
             raise RuntimeError("Erro de compilacao do Fragment Shader")
 
         # If success atach the compiled codes to the program
-        glAttachShader(self.__program, vertex)
-        glAttachShader(self.__program, fragment)
+        glAttachShader(program, vertex)
+        glAttachShader(program, fragment)
 
-        # Build program
-        glLinkProgram(self.__program)
-        if not glGetProgramiv(self.__program, GL_LINK_STATUS):
-            print(glGetProgramInfoLog(self.__program))
+        # Build program (allowing the driver to give back the linked binary)
+        if Shader.__binary_supported():
+            glProgramParameteri(program, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
+        glLinkProgram(program)
+        if not glGetProgramiv(program, GL_LINK_STATUS):
+            print(glGetProgramInfoLog(program))
             raise RuntimeError('Linking error')
 
         # Delete shaders (we don't need them anymore after compile)
         glDeleteShader(vertex)
         glDeleteShader(fragment)
-        self.vertex_code   = None
-        self.fragment_code = None
+        return program
+
 
-        # Save the position attrib location
-        self.__attributes['position'] = glGetAttribLocation(self.__program, "position")
+    def __binary_supported() -> bool:
+        """Checks if the driver can save and load linked programs"""
+        return bool(glGetProgramBinary) and glGetIntegerv(GL_NUM_PROGRAM_BINARY_FORMATS) > 0
+
+
+    def __binary_path(key) -> str:
+        """Cache file of the program, also keyed by the driver (binaries are not portable)"""
+        driver = b"|".join(glGetString(name) or b"" for name in (GL_VENDOR, GL_RENDERER, GL_VERSION))
+        driver_hash = hashlib.sha1(driver).hexdigest()[:12]
+        return os.path.join(Shader.binary_cache_dir, "program-{}-{}.bin".format(key[:16], driver_hash))
+
+
+    def __load_binary(key) -> int:
+        """
+        Creates the program from the cached binary. Returns None if there is no cache or
+        the driver rejects it (Ex: after an update), so the program must be compiled.
+        """
+        if Shader.binary_cache_dir == None or not Shader.__binary_supported():
+            return None
 
+        path = Shader.__binary_path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as file:
+            content = file.read()
 
-    def use(self) -> None:
-        """Activate the current shader program to be used in GPU."""
-        glUseProgram(self.__program)
+        binary_format = int.from_bytes(content[:4], "little")
+        binary = np.frombuffer(content[4:], dtype=np.uint8)
+        program = glCreateProgram()
+        glProgramBinary(program, binary_format, binary, len(binary))
+        if not glGetProgramiv(program, GL_LINK_STATUS):
+            glDeleteProgram(program)
+            os.remove(path)
+            return None
+        return program
+
+
+    def __save_binary(key, program) -> None:
+        """Saves the linked program binary (in a temporary file to be atomic)"""
+        if Shader.binary_cache_dir == None or not Shader.__binary_supported():
+            return
+
+        length = glGetProgramiv(program, GL_PROGRAM_BINARY_LENGTH)
+        if length <= 0:
+            return
+        binary = np.zeros(length, dtype=np.uint8)
+        binary_format = GLenum(0)
+        glGetProgramBinary(program, length, None, binary_format, binary)
+
+        os.makedirs(Shader.binary_cache_dir, exist_ok=True)
+        path = Shader.__binary_path(key)
+        temporary_path = path + ".{}.tmp".format(os.getpid())
+        with open(temporary_path, "wb") as file:
+            file.write(int(binary_format.value).to_bytes(4, "little"))
+            file.write(binary.tobytes())
+        os.replace(temporary_path, path)
+
+
+    def configure_vertex_array(self, vertex_buffer=None) -> int:
+        """
+        Returns the Vertex Array Object of the program with the `vertex_buffer` informed
+        (by default the Shader.vertex_buffer), creating it in the first call with the
+        attributes pointing to the buffer. The VAO keeps valid while the buffer is 
+        updated with glBufferData, so it only has to be done once.
+        """
+        if vertex_buffer == None:
+            vertex_buffer = Shader.vertex_buffer
+        vertex_arrays = self.__shared["vertex_arrays"]
+        if vertex_buffer in vertex_arrays:
+            return vertex_arrays[vertex_buffer]
+
+        vertex_array = glGenVertexArrays(1)
+        glBindVertexArray(vertex_array)
+        Shader.current_vertex_array = vertex_array
+        if vertex_buffer != None:
+            glBindBuffer(GL_ARRAY_BUFFER, vertex_buffer)
+
+        # Vertex format: (x, y, z, r, g, b, a) float32
         glEnableVertexAttribArray(self.__attributes['position'])
-        glVertexAttribPointer(self.__attributes['position'], 3, GL_FLOAT, False, 12, ctypes.c_void_p(0))
+        glVertexAttribPointer(self.__attributes['position'], 3, GL_FLOAT, False, 28, ctypes.c_void_p(0))
+        if self.__attributes['color'] != -1:
+            glEnableVertexAttribArray(self.__attributes['color'])
+            glVertexAttribPointer(self.__attributes['color'], 4, GL_FLOAT, False, 28, ctypes.c_void_p(12))
+
+        vertex_arrays[vertex_buffer] = vertex_array
+        return vertex_array
+
+
+    def use(self, vertex_buffer=None) -> None:
+        """
+        Activate the current shader program to be used in GPU, with its vertex array
+        of the `vertex_buffer` informed or, by default, of the Shader.vertex_buffer.
+        The program and vertex array are only switched if they aren't the current ones.
+        """
+        if Shader.current_program != self.__program:
+            glUseProgram(self.__program)
+            Shader.current_program = self.__program
+
+        vertex_array = self.configure_vertex_array(vertex_buffer)
+        if Shader.current_vertex_array != vertex_array:
+            glBindVertexArray(vertex_array)
+            Shader.current_vertex_array = vertex_array
+
+
+    def __changed(self, name, value) -> bool:
+        """
+        Checks if the uniform is active and its value differs from the last one sent,
+        saving the new value in the shadow copy.
+        """
+        if name not in self.__uniforms or self.__uniforms_values.get(name) == value:
+            return False
+
+        self.__uniforms_values[name] = value
+        return True
+
+
+    def setInt(self, name, value) -> None:
+        """Uniform Helper (also used to select the texture unit of samplers)"""
+        if self.__changed(name, value):
+            glUniform1i(self.__uniforms[name], value)
 
 
     def setFloat(self, name, value) -> None:
         """Uniform Helper"""
-        if name not in self.__uniforms.keys():
-            self.__uniforms[name] = glGetUniformLocation(self.__program, name)
-        glUniform1f(self.__uniforms[name], value)
+        if self.__changed(name, value):
+            glUniform1f(self.__uniforms[name], value)
 
 
     def set2Float(self, name, value) -> None:
         """Uniform Helper"""
-        if name not in self.__uniforms.keys():
-            self.__uniforms[name] = glGetUniformLocation(self.__program, name)
-        glUniform2f(self.__uniforms[name], value[0], value[1])
+        if self.__changed(name, (value[0], value[1])):
+            glUniform2f(self.__uniforms[name], value[0], value[1])
 
 
     def set3Float(self, name, value) -> None:
         """Uniform Helper"""
-        if name not in self.__uniforms.keys():
-            self.__uniforms[name] = glGetUniformLocation(self.__program, name)
-        glUniform3f(self.__uniforms[name], value[0], value[1], value[2])
+        if self.__changed(name, (value[0], value[1], value[2])):
+            glUniform3f(self.__uniforms[name], value[0], value[1], value[2])
 
 
     def set4Float(self, name, value) -> None:
         """Uniform Helper"""
-        if name not in self.__uniforms.keys():
-            self.__uniforms[name] = glGetUniformLocation(self.__program, name)
-        glUniform4f(self.__uniforms[name], value[0], value[1], value[2], value[3])
+        if self.__changed(name, (value[0], value[1], value[2], value[3])):
+            glUniform4f(self.__uniforms[name], value[0], value[1], value[2], value[3])
 
 
     def set4fMatrix(self, name, value) -> None:
-        """Uniform Helper"""
-        if name not in self.__uniforms.keys():
-            self.__uniforms[name] = glGetUniformLocation(self.__program, name)
-        glUniformMatrix4fv(self.__uniforms[name], 1, GL_TRUE, value)
\ No newline at end of file
+        """Uniform Helper (compares the matrix by its raw float32 bytes)"""
+        value = np.asarray(value, dtype=np.float32)
+        if self.__changed(name, value.tobytes()):
+            glUniformMatrix4fv(self.__uniforms[name], 1, GL_TRUE, value)
@@ -2,6 +2,9 @@
 
 # Obs: esse shader não considera que existem vértices de shader, usando a 
 #      posição normalizada do atributo position para realizar os mapeamentos.
+#
+#      As texturas de todos os tipos ficam em uma única GL_TEXTURE_2D_ARRAY (ver 
+#      GameController.__configure_textures) e cada tipo escolhe a sua camada em u_layer.
 
 vertex_code = """
     attribute vec3 position;
@@ -13,23 +16,25 @@ vertex_code = """
         gl_Position = u_model_matrix * vec4(position, 1.0);
 
         // Prevent multiply by 0
-        u_pattern_repeat.x = max(u_pattern_repeat.x, 1.0);
-        u_pattern_repeat.y = max(u_pattern_repeat.y, 1.0);
+        vec2 pattern_repeat = max(u_pattern_repeat, vec2(1.0));
 
-        fPosition   = position.xy * u_pattern_repeat;
+        fPosition   = position.xy * pattern_repeat;
     }
 """
 
 fragment_code = """
+    #extension GL_EXT_texture_array : enable
+
     varying vec2 fPosition;
     uniform vec2 u_pattern_repeat;
     uniform vec4 u_color;
     uniform float u_opacity;
-    uniform sampler2D samplerTexture;
+    uniform float u_layer;
+    uniform sampler2DArray samplerTexture;
 
     void main(){ 
         vec2 textCoord = vec2((fPosition.x+1.0)/2.0, (fPosition.y+1.0)/2.0);
-        vec4 texture = texture2D(samplerTexture, textCoord);
+        vec4 texture = texture2DArray(samplerTexture, vec3(textCoord, u_layer));
         gl_FragColor  = vec4(texture.xyz, u_opacity);
     }
-"""
\ No newline at end of file
+"""